@@ -1,110 +1,174 @@
-import os
-import json
 import pygame
+from datetime import datetime
+from fonts import get_font, render_text
+from store import AchievementStore
+
+# Lists on the achievement screen: (name, tab text)
+VIEWS = [("top", "Cao nhất"), ("recent", "Gần đây"), ("days", "Theo ngày")]
+ROWS_PER_PAGE = 6
+
 
 class Achievement:
-    def __init__(self, file_path="achievements.json"):
+    def __init__(self, file_path="achievements.jsonl", legacy_path="achievements.json"):
         """
         Initialize the achievement system.
 
-        :param file_path: Path to the JSON file storing achievements.
+        :param file_path: Path to the JSON lines log storing achievements.
+        :param legacy_path: Old JSON file, its achievements are moved into the log once.
         """
         self.file_path = file_path
-        self.achievements = self.load_achievements()
+        self.store = AchievementStore(file_path, legacy_path=legacy_path)
         self.last_saved_score = None
-
-    def load_achievements(self):
-        """
-        Load achievements from the file. If the file doesn't exist, create an empty one.
-
-        :return: A dictionary of achievements.
-        """
-        if os.path.exists(self.file_path):
-            with open(self.file_path, 'r') as f:
-                return json.load(f)
-        else:
-            return {}
+        self.back_button = None  # set by show()
+        self.clear_button = None
+        self.view = "top"
+        self.page = 0
+        self.tab_buttons = {}  # view name -> Rect, set by show()
+        self.previous_button = None
+        self.next_button = None
+        self.rows_cache = (None, None, [])  # (view, summary version, row texts)
 
     def save_achievement(self, score):
         """
-        Save a new achievement with the given score.
+        Save a new achievement with the given score. Does not wait for the disk.
 
         :param score: The score achieved in the current game session.
         """
         if score != self.last_saved_score:
-            from datetime import datetime
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.achievements[timestamp] = score
-            with open(self.file_path, 'w') as f:
-                json.dump(self.achievements, f, indent=4)
+            self.store.add(timestamp, score)
             self.last_saved_score = score
 
     def clear_achievements(self):
         """
         Clear all achievements.
         """
-        self.achievements = {}
-        with open(self.file_path, 'w') as f:
-            json.dump(self.achievements, f, indent=4)
+        self.store.clear()
+
+    def close(self):
+        """Wait until every saved achievement is on disk."""
+        self.store.close()
+
+    def rows(self):
+        """
+        Return the texts of every row of the current list.
+
+        Built from the summary, which only keeps the top-K, the newest records
+        and one best per day, so this costs the same however long the history
+        is. Rebuilt only after a new score or a clear.
+        """
+        summary = self.store.summary
+        view, version, rows = self.rows_cache
+        if view == self.view and version == summary.version:
+            return rows
+        if self.view == "top":
+            rows = [f"#{rank}: {score} điểm - {timestamp}"
+                    for rank, (timestamp, score) in enumerate(summary.leaderboard(), start=1)]
+        elif self.view == "recent":
+            # Newest first, numbered like the whole history
+            rows = [f"Lần {summary.count - i}: {timestamp} - {score} điểm"
+                    for i, (timestamp, score) in enumerate(reversed(summary.recent))]
+        else:
+            rows = [f"{day}: {score} điểm" for day, score in sorted(summary.day_best.items(), reverse=True)]
+        self.rows_cache = (self.view, summary.version, rows)
+        return rows
+
+    def page_count(self):
+        return max(1, (len(self.rows()) + ROWS_PER_PAGE - 1) // ROWS_PER_PAGE)
 
     def show(self, screen):
         """
-        Display all achievements on the screen.
+        Draw one page of achievements on the screen. The main loop shows the frame,
+        clicks are handled by handle_input().
 
         :param screen: The pygame display surface.
         """
-        font = pygame.font.Font(pygame.font.match_font('Tahoma'), 36)
-        y_offset = 150
+        font = get_font('Tahoma', 36)
         screen.fill((173, 216, 230))  # Clear the screen with a light blue background
 
-        title = font.render("Thành Tựu", True, (0, 0, 0))
+        title = render_text("Thành Tựu", font, (0, 0, 0))
         screen.blit(title, (screen.get_width() // 2 - title.get_width() // 2, 10))
 
-        if not self.achievements:
-            no_achievements_text = font.render("Bạn chưa có thành tựu nào", True, (0, 0, 0))
+        # Tabs for the lists
+        tab_font = get_font('Tahoma', 24)
+        for i, (view, text) in enumerate(VIEWS):
+            tab = self.tab_buttons[view] = pygame.Rect(100 + i * 200, 60, 190, 36)
+            color = (0, 100, 0) if view == self.view else (90, 140, 90)
+            pygame.draw.rect(screen, color, tab, border_radius=10)
+            tab_text = render_text(text, tab_font, (255, 255, 255))
+            screen.blit(tab_text, (tab.centerx - tab_text.get_width() // 2, tab.centery - tab_text.get_height() // 2))
+
+        summary = self.store.summary
+        if not summary.count:
+            no_achievements_text = render_text("Bạn chưa có thành tựu nào", font, (0, 0, 0))
             screen.blit(no_achievements_text, (screen.get_width() // 2 - no_achievements_text.get_width() // 2, screen.get_height() // 2))
         else:
-            for i, (timestamp, score) in enumerate(self.achievements.items(), start=1):
-                achievement_text = f"Lần {i}: {timestamp} - {score} điểm"
-                text_surface = font.render(achievement_text, True, (0, 0, 0))
-                screen.blit(text_surface, (50, y_offset))
+            small_font = get_font('Tahoma', 22)
+            summary_text = render_text(f"{summary.count} lần chơi - cao nhất {summary.best} - "
+                                       f"trung bình {summary.average:.1f} (10 lần gần đây {summary.recent_average():.1f})",
+                                       small_font, (0, 0, 0))
+            screen.blit(summary_text, (screen.get_width() // 2 - summary_text.get_width() // 2, 105))
+
+            # Only the rows of the current page are drawn
+            row_font = get_font('Tahoma', 28)
+            self.page = min(self.page, self.page_count() - 1)
+            first = self.page * ROWS_PER_PAGE
+            y_offset = 140
+            for row in self.rows()[first:first + ROWS_PER_PAGE]:
+                screen.blit(render_text(row, row_font, (0, 0, 0)), (50, y_offset))
                 y_offset += 40
 
+            # Page buttons
+            self.previous_button = pygame.Rect(40, 400, 50, 50)
+            self.next_button = pygame.Rect(screen.get_width() - 90, 400, 50, 50)
+            for button, text, active in ((self.previous_button, "<", self.page > 0),
+                                         (self.next_button, ">", self.page < self.page_count() - 1)):
+                pygame.draw.rect(screen, (0, 100, 0) if active else (150, 150, 150), button, border_radius=15)
+                arrow = render_text(text, font, (255, 255, 255))
+                screen.blit(arrow, (button.centerx - arrow.get_width() // 2, button.centery - arrow.get_height() // 2))
+            page_text = render_text(f"Trang {self.page + 1}/{self.page_count()}", small_font, (0, 0, 0))
+            screen.blit(page_text, (100, 412))
+
         # Vẽ nút quay lại màn hình chính
-        back_button = pygame.Rect(screen.get_width() // 2 - 100, screen.get_height() - 100, 200, 50)
+        back_button = self.back_button = pygame.Rect(screen.get_width() // 2 - 100, screen.get_height() - 100, 200, 50)
         pygame.draw.rect(screen, (0, 100, 0), back_button, border_radius=15)
         pygame.draw.rect(screen, (255, 255, 255), back_button, 3, border_radius=15)
         
-        button_font = pygame.font.Font(pygame.font.match_font('Tahoma'), 40)
-        button_text = button_font.render("Quay lại", True, (255, 255, 255))
+        button_font = get_font('Tahoma', 40)
+        button_text = render_text("Quay lại", button_font, (255, 255, 255))
         text_pos = (back_button.centerx - button_text.get_width() // 2,
                    back_button.centery - button_text.get_height() // 2)
         screen.blit(button_text, text_pos)
 
         # Vẽ nút xóa thành tựu
-        clear_button = pygame.Rect(screen.get_width() // 2 - 100, screen.get_height() - 200, 200, 50)
+        clear_button = self.clear_button = pygame.Rect(screen.get_width() // 2 - 100, screen.get_height() - 200, 200, 50)
         pygame.draw.rect(screen, (200, 0, 0), clear_button, border_radius=15)
         pygame.draw.rect(screen, (255, 255, 255), clear_button, 3, border_radius=15)
         
-        clear_text = button_font.render("Xóa Thành Tựu", True, (255, 255, 255))
+        clear_text = render_text("Xóa Thành Tựu", button_font, (255, 255, 255))
         clear_text_pos = (clear_button.centerx - clear_text.get_width() // 2,
                           clear_button.centery - clear_text.get_height() // 2)
         screen.blit(clear_text, clear_text_pos)
 
-        pygame.display.flip()
-
-        # wait for user interaction
-        waiting = True
-        while waiting:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if back_button.collidepoint(event.pos):
-                        waiting = False
-                        break
-                    elif clear_button.collidepoint(event.pos):
-                        self.clear_achievements()
-                        self.show(screen)  # Refresh the screen
-                        break
+    def handle_input(self, frame):
+        """
+        Handle clicks on the achievement screen.
+
+        :param frame: The InputFrame of this frame.
+        :return: True when the player clicked the back button.
+        """
+        if self.back_button is None:
+            return False  # not drawn yet
+        if frame.clicked(self.back_button):
+            return True
+        if frame.clicked(self.clear_button):
+            self.clear_achievements()
+        for view, tab in self.tab_buttons.items():
+            if frame.clicked(tab):
+                self.view = view
+                self.page = 0
+        if (self.previous_button and frame.clicked(self.previous_button)) or frame.key_pressed(pygame.K_LEFT):
+            self.page = max(0, self.page - 1)
+        if (self.next_button and frame.clicked(self.next_button)) or frame.key_pressed(pygame.K_RIGHT):
+            self.page = min(self.page_count() - 1, self.page + 1)
+        return False
@@ -0,0 +1,173 @@
+import numpy as np
+import pygame
+from audio import audio
+from spawn import Trash, TrashSpawner
+from sprites import get_sprite
+from catalogue import catalogue
+
+
+class ArrayTrashSpawner(TrashSpawner):
+    # One array per column, all the same length
+    COLUMNS = ("x", "y", "width", "height", "type_id", "spawn_time")
+
+    def __init__(self, spawn_area_width=800, spawn_area_height=600, max_trash=30, data_book=None, clock=None,
+                 rng=None, capacity=1024):
+        """
+        TrashSpawner that keeps trash in NumPy arrays instead of Trash objects.
+
+        Positions, sizes, type ids and spawn times are columns of
+        preallocated arrays (structure of arrays), so culling, collision and
+        expiry are a few vectorized operations over all trash, and the
+        visible trash is drawn with one Surface.blits call. Spawning uses the
+        same random numbers as TrashSpawner, so both give the same game.
+
+        :param capacity: Initial array size, doubled when full.
+        """
+        super().__init__(spawn_area_width, spawn_area_height, max_trash, data_book, clock, rng)
+        self.trash_list = None  # replaced by the arrays below
+        self.count = 0
+        self.x = np.zeros(capacity, np.int32)  # world position of the hitbox
+        self.y = np.zeros(capacity, np.int32)
+        self.width = np.zeros(capacity, np.int32)
+        self.height = np.zeros(capacity, np.int32)
+        self.type_id = np.zeros(capacity, np.int16)  # index into catalogue.types
+        self.spawn_time = np.zeros(capacity, np.int64)  # milliseconds of self.clock()
+        self.images = {}  # (width, height) -> (image, offset_x, offset_y)
+
+    def _image(self, width, height):
+        """Return the shared image of a trash size and where it sits around the hitbox."""
+        entry = self.images.get((width, height))
+        if entry is None:
+            image_width, image_height = Trash.image_size(width, height)
+            # Most of the image is transparent: an RLE copy that keeps per-pixel alpha skips those pixels
+            image = get_sprite(Trash.trash_image_path, (image_width, image_height)).copy()
+            image.set_alpha(255, pygame.RLEACCEL)
+            entry = self.images[(width, height)] = (image, (image_width - width) // 2, (image_height - height) // 2)
+        return entry
+
+    def _image_rect(self, i):
+        width, height = int(self.width[i]), int(self.height[i])
+        image, offset_x, offset_y = self._image(width, height)
+        return pygame.Rect(int(self.x[i]) - offset_x, int(self.y[i]) - offset_y, image.get_width(), image.get_height())
+
+    def add_trash(self, x, y, info, width=100, height=100):
+        if self.count == len(self.x):
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                setattr(self, name, np.concatenate([column, np.zeros_like(column)]))
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.width[i] = width
+        self.height[i] = height
+        self.type_id[i] = catalogue.index_of[info["id"]]
+        self.spawn_time[i] = self.clock()
+        self.count += 1
+        if self.record_changes:
+            self.changed_rects.append(self._image_rect(i))
+
+    def remove_where(self, mask):
+        """
+        Remove the trash where mask is True, keeping the order of the rest.
+
+        :param mask: Boolean array of length self.count.
+        :return: Number of trash removed.
+        """
+        removed = int(np.count_nonzero(mask))
+        if removed:
+            if self.record_changes:
+                self.changed_rects.extend(self._image_rect(i) for i in np.flatnonzero(mask))
+            keep = ~mask
+            new_count = self.count - removed
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                column[:new_count] = column[:self.count][keep]
+            self.count = new_count
+        return removed
+
+    def trash_count(self):
+        return self.count
+
+    def trash_positions(self):
+        n = self.count
+        return zip(self.x[:n].tolist(), self.y[:n].tolist(), self.width[:n].tolist(), self.height[:n].tolist())
+
+    def despawn_expired(self):
+        """
+        Remove every trash older than despawn_time.
+
+        Trash is added in clock order and removing keeps the order, so the
+        spawn times are sorted and the expired trash is always at the front:
+        a binary search finds it without looking at the rest.
+
+        :return: Number of trash removed.
+        """
+        n = self.count
+        if self.despawn_time is None or not n or self.spawn_time[0] > self.clock() - self.despawn_time:
+            return 0
+        expired = int(np.searchsorted(self.spawn_time[:n], self.clock() - self.despawn_time, side="right"))
+        if self.record_changes:
+            self.changed_rects.extend(self._image_rect(i) for i in range(expired))
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:n - expired] = column[expired:n]
+        self.count = n - expired
+        return expired
+
+    def draw(self, screen, offset_x=0, offset_y=0, beach=True):
+        """
+        Draw the trash on screen with one blits call per trash size.
+        """
+        n = self.count
+        if not n:
+            return
+        screen_x = self.x[:n] - offset_x
+        screen_y = self.y[:n] - offset_y
+        # Same rule as Trash.draw: the hitbox corner must be on screen
+        visible = ((screen_x >= 0) & (screen_x <= screen.get_width()) &
+                   (screen_y >= 0) & (screen_y <= screen.get_height()))
+        if not visible.any():
+            return
+        widths = self.width[:n][visible]
+        heights = self.height[:n][visible]
+        screen_x = screen_x[visible]
+        screen_y = screen_y[visible]
+
+        if (widths == widths[0]).all() and (heights == heights[0]).all():
+            groups = [((int(widths[0]), int(heights[0])), slice(None))]  # the usual case, one size
+        else:
+            sizes = sorted(set(zip(widths.tolist(), heights.tolist())))
+            groups = [(size, (widths == size[0]) & (heights == size[1])) for size in sizes]
+        for size, selection in groups:
+            image, image_offset_x, image_offset_y = self._image(*size)
+            xs = (screen_x[selection] - image_offset_x).tolist()
+            ys = (screen_y[selection] - image_offset_y).tolist()
+            screen.blits([(image, position) for position in zip(xs, ys)], doreturn=False)
+
+    def check_collision(self, character, trash_info):
+        """
+        Check collision with the fixed hitbox of the character against all trash at once.
+        """
+        n = self.count
+        if not n:
+            return
+        hitbox = character.get_hitbox()
+        left = hitbox.x + self.screen_offset_x
+        top = hitbox.y + self.screen_offset_y
+        x = self.x[:n]
+        y = self.y[:n]
+        hits = ((x < left + hitbox.width) & (left < x + self.width[:n]) &
+                (y < top + hitbox.height) & (top < y + self.height[:n]))
+        if not hits.any():
+            return
+        for type_id in self.type_id[:n][hits].tolist():
+            info = catalogue.types[type_id]
+            self.score += info['points']
+            trash_info.collect_trash(info)
+            self.recent_collections.append((info['points'], self.clock()))
+            audio.play("collect")
+            self.display_info = True  # Show trash info box
+            self.current_trash_id = info['id']  # Save ID of the current trash
+            if self.data_book:
+                self.data_book.collect_trash(info['id'])  # Update collection status in DataBook
+        self.remove_where(hits)
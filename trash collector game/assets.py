@@ -0,0 +1,184 @@
+import os
+import threading
+import time
+import pygame
+from fonts import get_font
+
+
+class AssetManager:
+    # path to resource folder
+    resource_path = os.path.join(os.path.dirname(__file__), "resource")
+
+    def __init__(self, resource_path=None):
+        """
+        Initialize the asset manager.
+
+        Every image is decoded from disk once, converted to the display
+        format once and then shared. Assets can be preloaded on a background
+        thread, anything else is loaded lazily the first time it is asked for.
+
+        :param resource_path: Folder that relative asset names are looked up in.
+        """
+        if resource_path:
+            self.resource_path = resource_path
+        self.decoded = {}  # path -> Surface straight from disk, not converted yet
+        self.images = {}  # (path, size, alpha) -> converted Surface
+        self.sounds = {}  # path -> pygame Sound
+        self.timings = {}  # asset name -> seconds spent loading it
+        self.pending = {}  # path -> Event, set when the background loader has decoded it
+        self.preload_progress = (0, 0)  # (loaded, total) of the running preload
+        self.lock = threading.Lock()
+        self.pack = None  # baked atlas.AssetPack, asked before any file is decoded
+
+    def use_pack(self, path):
+        """
+        Take images from a pack made by atlas.py when it has them.
+
+        :param path: The pack file.
+        :return: True if the pack was opened, False if it is missing or from another version.
+        """
+        from atlas import AssetPack
+        start = time.perf_counter()
+        try:
+            self.pack = AssetPack(path)
+        except (OSError, ValueError):
+            self.pack = None
+            return False
+        self.timings[os.path.basename(path)] = time.perf_counter() - start
+        return True
+
+    def path(self, name):
+        """Return the full path of an asset, bare file names are looked up in the resource folder."""
+        if os.path.isabs(name) or os.path.dirname(name):
+            return name
+        return os.path.join(self.resource_path, name)
+
+    def _decode(self, path):
+        """Read an image file from disk once (safe to call from the loader thread)."""
+        surface = self.decoded.get(path)
+        if surface is None:
+            start = time.perf_counter()
+            surface = pygame.image.load(path)
+            self.timings[os.path.basename(path)] = time.perf_counter() - start
+            with self.lock:
+                self.decoded[path] = surface
+        return surface
+
+    def image(self, name, size=None, alpha=True):
+        """
+        Get an image converted to the display format, loading it on first use.
+
+        :param name: File name in the resource folder, or a full path.
+        :param size: Optional (width, height) to get a scaled copy, which is cached too.
+        :param alpha: Use convert_alpha() to keep transparency, otherwise convert().
+        :return: A shared pygame Surface, do not draw onto it.
+        """
+        path = self.path(name)
+        key = (path, tuple(size) if size else None, alpha)
+        surface = self.images.get(key)
+        if surface is not None:
+            return surface
+
+        if self.pack:
+            surface = self.pack.image(path, key[1], alpha)
+            if surface is not None:
+                # Pack pixels are already in the usual display format, other displays get a converted copy
+                display = pygame.display.get_surface()
+                if display is not None and display.get_masks()[:3] != surface.get_masks()[:3]:
+                    surface = surface.convert_alpha() if alpha else surface.convert()
+                self.images[key] = surface
+                return surface
+
+        # The background loader is already reading this file, wait for it instead of loading twice
+        event = self.pending.get(path)
+        if event is not None:
+            event.wait()
+
+        surface = self._decode(path)
+        if size:
+            surface = pygame.transform.scale(surface, key[1])
+        # Converting needs the display, so it always happens here on the main thread
+        if pygame.display.get_surface() is not None:
+            start = time.perf_counter()
+            surface = surface.convert_alpha() if alpha else surface.convert()
+            name = os.path.basename(path)
+            self.timings[name] = self.timings.get(name, 0) + time.perf_counter() - start
+        self.images[key] = surface
+        return surface
+
+    def image_size(self, name):
+        """
+        Return the (width, height) of an image file, from the pack when it has it.
+        """
+        path = self.path(name)
+        size = self.pack.source_size(path) if self.pack else None
+        return size or self.image(path).get_size()
+
+    def sound(self, name):
+        """
+        Get a sound effect, loading it on first use.
+
+        :param name: File name in the resource folder, or a full path.
+        :return: A pygame Sound, or None if the mixer is not available.
+        """
+        path = self.path(name)
+        sound = self.sounds.get(path)
+        if sound is None:
+            if not pygame.mixer.get_init():
+                return None
+            start = time.perf_counter()
+            sound = pygame.mixer.Sound(path)
+            self.timings[os.path.basename(path)] = time.perf_counter() - start
+            self.sounds[path] = sound
+        return sound
+
+    def font(self, family="Tahoma", size=24):
+        """Get a font, shared with the rest of the game through fonts.get_font()."""
+        return get_font(family, size)
+
+    def preload(self, names, progress=None):
+        """
+        Decode images on a background thread.
+
+        :param names: Image names to load.
+        :param progress: Optional function called as progress(loaded, total, name)
+                         from the loader thread after each image.
+        :return: The started loader thread.
+        """
+        paths = [self.path(name) for name in names]
+        if self.pack:
+            paths = [path for path in paths if not self.pack.covers(path)]  # nothing to decode
+        for path in paths:
+            if path not in self.decoded:
+                self.pending[path] = threading.Event()
+        self.preload_progress = (0, len(paths))
+
+        def load_all():
+            for i, path in enumerate(paths, start=1):
+                try:
+                    self._decode(path)
+                except (pygame.error, OSError):
+                    pass  # image() will try again on the main thread and raise the error there
+                finally:
+                    event = self.pending.pop(path, None)
+                    if event is not None:
+                        event.set()
+                self.preload_progress = (i, len(paths))
+                if progress:
+                    progress(i, len(paths), os.path.basename(path))
+
+        loader = threading.Thread(target=load_all, name="asset-preload", daemon=True)
+        loader.start()
+        return loader
+
+    def report(self):
+        """
+        Return load timings, slowest first.
+
+        :return: List of (asset name, milliseconds).
+        """
+        return sorted(((name, seconds * 1000) for name, seconds in self.timings.items()),
+                      key=lambda item: item[1], reverse=True)
+
+
+assets = AssetManager()
@@ -0,0 +1,167 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+import pygame
+
+MAGIC = b"TCAP"
+VERSION = 1
+HEADER = struct.Struct("<4sB3xQQ")  # magic, version, index offset, index length
+ALIGN = 4096  # every image starts on a page, so mapping it only reads its own pages
+PIXEL_FORMAT = "BGRA"  # byte order of ARGB8888, the display format on little-endian machines
+
+resource_path = os.path.join(os.path.dirname(__file__), "resource")
+PACK_PATH = os.path.join(os.path.dirname(__file__), "assets.pack")
+
+
+def pack_entries():
+    """
+    Every image the game draws, at the size it draws it.
+
+    :return: List of (file name, size or None for the file's own size, alpha).
+    """
+    from char import Character
+    from spawn import Trash
+    from catalogue import catalogue
+    from trashinfo import TrashImageCache
+
+    entries = [("beach.png", None, False), ("ocean.png", None, False)]
+    for name in ("character1.png", "character2.png"):
+        entries.append((name, Character.scale_factor, True))  # a divisor, the size depends on the file
+    entries.append((os.path.basename(Trash.trash_image_path), Trash.image_size(), True))
+    for trash in catalogue:
+        for size in (TrashImageCache.THUMBNAIL_SIZE, TrashImageCache.DETAIL_SIZE):
+            entries.append((os.path.basename(trash["image"]), size, True))
+    return entries
+
+
+def bake(out_path=PACK_PATH, folder=resource_path):
+    """
+    Decode and scale every image of pack_entries() once and write the raw
+    pixels into one file that the game maps into memory at startup.
+
+    :param out_path: Pack file to write.
+    :param folder: Folder with the source images.
+    :return: Number of images written.
+    """
+    sources = {}
+    images = []
+    decoded = {}
+    temp_path = out_path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(b"\0" * HEADER.size)
+        for name, size, alpha in pack_entries():
+            path = os.path.join(folder, name)
+            if name not in decoded:
+                decoded[name] = pygame.image.load(path)
+                stat = os.stat(path)
+                sources[name] = {"mtime_ns": stat.st_mtime_ns, "bytes": stat.st_size,
+                                 "width": decoded[name].get_width(), "height": decoded[name].get_height()}
+            surface = decoded[name]
+            if isinstance(size, int):
+                size = (surface.get_width() // size, surface.get_height() // size)
+            if size:
+                surface = pygame.transform.scale(surface, size)
+            offset = -f.tell() % ALIGN + f.tell()
+            f.seek(offset)
+            f.write(pygame.image.tobytes(surface, PIXEL_FORMAT))
+            images.append({"name": name, "size": list(size) if size else None, "alpha": alpha,
+                           "offset": offset, "width": surface.get_width(), "height": surface.get_height()})
+
+        index = json.dumps({"format": PIXEL_FORMAT, "sources": sources, "images": images}).encode()
+        index_offset = f.tell()
+        f.write(index)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, index_offset, len(index)))
+    os.replace(temp_path, out_path)
+    return len(images)
+
+
+class AssetPack:
+    def __init__(self, path=PACK_PATH):
+        """
+        Open a pack written by bake().
+
+        The file is memory-mapped and every Surface is made straight on top
+        of its bytes, so nothing is decoded, scaled or copied at startup and
+        the pages of an image are only read when it is first drawn.
+
+        :param path: The pack file.
+        :raises OSError: The file cannot be read.
+        :raises ValueError: The file is not a pack of this version.
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            # Copy-on-write, so a Surface drawn onto by mistake never changes the file
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, version, index_offset, index_length = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} asset pack")
+        index = json.loads(self.data[index_offset:index_offset + index_length])
+        if index["format"] != PIXEL_FORMAT:
+            raise ValueError(f"{path} holds {index['format']} pixels, not {PIXEL_FORMAT}")
+        self.sources = index["sources"]
+        self.images = {(image["name"], tuple(image["size"]) if image["size"] else None, image["alpha"]): image
+                       for image in index["images"]}
+        self.fresh = {}  # file name -> True if the source file has not changed since the bake
+
+    def covers(self, path):
+        """True if the pack was baked from this file as it is now (or the file is not there at all)."""
+        name = os.path.basename(path)
+        fresh = self.fresh.get(name)
+        if fresh is None:
+            source = self.sources.get(name)
+            try:
+                stat = os.stat(path)
+                fresh = bool(source) and (stat.st_mtime_ns, stat.st_size) == (source["mtime_ns"], source["bytes"])
+            except OSError:
+                fresh = bool(source)  # shipped without the source images
+            self.fresh[name] = fresh
+        return fresh
+
+    def source_size(self, path):
+        """Return (width, height) of a source image without decoding it, or None."""
+        if not self.covers(path):
+            return None
+        source = self.sources[os.path.basename(path)]
+        return source["width"], source["height"]
+
+    def has(self, path, size=None, alpha=True):
+        """True if image() would return a Surface for these arguments."""
+        key = (os.path.basename(path), tuple(size) if size else None, alpha)
+        return key in self.images and self.covers(path)
+
+    def image(self, path, size=None, alpha=True):
+        """
+        Return a Surface on top of the pack bytes, or None if the pack does not have it.
+
+        :param path: Path of the source image.
+        :param size: (width, height), or None for the size of the source image.
+        :param alpha: Keep transparency; without it blits are plain copies.
+        """
+        entry = self.images.get((os.path.basename(path), tuple(size) if size else None, alpha))
+        if entry is None or not self.covers(path):
+            return None
+        width, height = entry["width"], entry["height"]
+        pixels = memoryview(self.data)[entry["offset"]:entry["offset"] + width * height * 4]
+        surface = pygame.image.frombuffer(pixels, (width, height), PIXEL_FORMAT)
+        if not alpha:
+            surface.set_alpha(None)
+        return surface
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake every game image into one memory-mapped asset pack.")
+    parser.add_argument("--out", default=PACK_PATH, help="pack file to write")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    count = bake(args.out)
+    print(f"Baked {count} images into {args.out} ({os.path.getsize(args.out) / 1e6:.1f} MB) "
+          f"in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import os
+import statistics
+import time
+from collections import deque
+import numpy as np
+import pygame
+from assets import assets
+
+# Mixer settings. SDL mixes one buffer ahead, so a small buffer keeps the delay from play() to the speaker short.
+FREQUENCY = 44100
+SAMPLE_SIZE = -16  # signed 16 bit
+CHANNELS = 2
+BUFFER = 512  # samples, about 12 ms at 44.1 kHz
+
+# Sound effects: name -> (file in the resource folder, notes played when the file is missing).
+# A note is (frequency in Hz, milliseconds), so the game has sounds before anyone records any.
+EFFECTS = {
+    "collect": ("collect.wav", [(880, 50), (1320, 80)]),
+    "start": ("start.wav", [(523, 80), (659, 80), (784, 140)]),
+    "day": ("day.wav", [(659, 90), (784, 90), (659, 140)]),
+    "finish": ("finish.wav", [(523, 110), (659, 110), (784, 110), (1047, 220)]),
+    "page": ("page.wav", [(1400, 25)]),
+}
+
+# Higher priority effects may take the channel of lower ones when all are busy
+PRIORITY = {"collect": 1, "page": 1, "start": 2, "day": 2, "finish": 3}
+
+
+def pre_init():
+    """Ask for the low-latency mixer settings. Must be called before pygame.init()."""
+    pygame.mixer.pre_init(FREQUENCY, SAMPLE_SIZE, CHANNELS, BUFFER)
+
+
+def synthesize(notes, volume=0.3):
+    """
+    Make a short chime for the current mixer format with NumPy.
+
+    :param notes: List of (frequency in Hz, milliseconds), played one after the other.
+    :param volume: Peak amplitude from 0 to 1.
+    :return: A pygame Sound.
+    """
+    frequency, size, channels = pygame.mixer.get_init()
+    parts = []
+    for hz, ms in notes:
+        t = np.arange(int(frequency * ms / 1000)) / frequency
+        fade = np.linspace(1.0, 0.0, len(t)) ** 2  # pluck: loud at once, then dying away
+        parts.append(np.sin(2 * np.pi * hz * t) * fade)
+    wave = np.concatenate(parts) * volume
+    if size < 0:
+        samples = (wave * (2 ** (abs(size) - 1) - 1)).astype(f"int{abs(size)}")
+    else:
+        samples = ((wave + 1) * (2 ** (size - 1) - 1)).astype(f"uint{size}")
+    if channels > 1:
+        samples = np.repeat(samples[:, None], channels, axis=1)
+    return pygame.sndarray.make_sound(np.ascontiguousarray(samples))
+
+
+class AudioEngine:
+    def __init__(self, channels=8, history=256):
+        """
+        Initialize the sound effect player.
+
+        Every effect is loaded once by start(), play() only picks a channel
+        from a fixed pool and starts it, so triggering a sound never touches
+        the disk. When all channels are busy, the oldest sound of the same or
+        a lower priority is cut off (voice stealing); if every channel plays
+        something more important the new sound is dropped.
+
+        :param channels: Size of the channel pool.
+        :param history: How many latencies are kept for report().
+        """
+        self.channel_count = channels
+        self.channels = []  # pygame Channels of the pool, empty until start()
+        self.voices = []  # per channel: (priority, start time) of the sound it plays last
+        self.sounds = {}  # effect name -> Sound
+        self.latencies = deque(maxlen=history)  # seconds from trigger to Channel.play() returning, measured
+        self.buffer_seconds = 0.0
+        self.played = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    def start(self):
+        """
+        Set up the channel pool and load every effect. Does nothing without a mixer.
+
+        :return: Number of effects loaded.
+        """
+        mixer = pygame.mixer.get_init()
+        if not mixer:
+            return 0
+        pygame.mixer.set_num_channels(self.channel_count)
+        self.channels = [pygame.mixer.Channel(i) for i in range(self.channel_count)]
+        self.voices = [(0, 0.0)] * self.channel_count
+        self.buffer_seconds = BUFFER / mixer[0]
+        for name, (file_name, notes) in EFFECTS.items():
+            path = assets.path(file_name)
+            self.sounds[name] = assets.sound(path) if os.path.exists(path) else synthesize(notes)
+        return len(self.sounds)
+
+    def _free_channel(self, priority):
+        """Return the index of an idle channel, or of the one to steal, or None."""
+        victim = None
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return i
+            voice_priority, started = self.voices[i]
+            if voice_priority <= priority and (victim is None or started < self.voices[victim][1]):
+                victim = i
+        if victim is not None:
+            self.stolen += 1
+        return victim
+
+    def play(self, name, trigger_time=None):
+        """
+        Play an effect that start() loaded.
+
+        :param name: Key of EFFECTS.
+        :param trigger_time: time.perf_counter() of the event that caused it, now if None.
+        :return: The Channel it plays on, or None if it was not played.
+        """
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None  # no mixer, or not an effect: never load here
+        if trigger_time is None:
+            trigger_time = time.perf_counter()
+        priority = PRIORITY.get(name, 1)
+        i = self._free_channel(priority)
+        if i is None:
+            self.dropped += 1
+            return None
+        channel = self.channels[i]
+        channel.play(sound)
+        now = time.perf_counter()
+        self.voices[i] = (priority, now)
+        self.latencies.append(now - trigger_time)
+        self.played += 1
+        return channel
+
+    def report(self):
+        """
+        Return counters and latencies.
+
+        Only the time from the trigger to Channel.play() returning is
+        measured. The mixer does not say when a sample reaches the speaker,
+        so the output latency is an estimate: that time plus one mixer
+        buffer, the longest SDL waits before mixing a new sound in. The
+        sound card and the system add more that is not counted.
+
+        :return: Dictionary with played, stolen and dropped counts, buffer_ms,
+                 the measured start_p50/start_p95 and the estimated
+                 output_p50/output_p95/output_max in milliseconds (None before the first sound).
+        """
+        result = {"played": self.played, "stolen": self.stolen, "dropped": self.dropped,
+                  "buffer_ms": round(self.buffer_seconds * 1000, 2)}
+        if self.latencies:
+            ms = sorted(latency * 1000 for latency in self.latencies)
+            cuts = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) > 1 else ms * 99
+            buffer_ms = self.buffer_seconds * 1000
+            result.update(start_p50=round(cuts[49], 3), start_p95=round(cuts[94], 3),
+                          output_p50=round(cuts[49] + buffer_ms, 2), output_p95=round(cuts[94] + buffer_ms, 2),
+                          output_max=round(ms[-1] + buffer_ms, 2))
+        else:
+            result.update(start_p50=None, start_p95=None, output_p50=None, output_p95=None, output_max=None)
+        return result
+
+audio = AudioEngine()
@@ -0,0 +1,383 @@
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Benchmarks never open a window or a sound card
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from inputs import InputFrame, PressedKeys
+
+resource_path = os.path.join(os.path.dirname(__file__), "resource")
+
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+
+STATES = ["start", "day1", "day2", "end", "data_book"]
+
+# Command line flag of main.py for each trash backend
+BACKEND_FLAGS = {"objects": [], "arrays": ["--array-trash"], "chunks": ["--chunked-world"]}
+
+# Arrow key held in each 2 second part of a gameplay run, so the camera keeps scrolling
+ROUTE = [pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP]
+
+
+def summarize(samples):
+    """
+    Turn timings into percentiles.
+
+    :param samples: Durations in seconds.
+    :return: Dictionary with samples, mean, p50, p95, p99 and max in milliseconds.
+    """
+    ms = sorted(sample * 1000 for sample in samples)
+    cuts = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) > 1 else ms * 99
+    return {
+        "samples": len(ms),
+        "mean": round(statistics.mean(ms), 4),
+        "p50": round(cuts[49], 4),
+        "p95": round(cuts[94], 4),
+        "p99": round(cuts[98], 4),
+        "max": round(ms[-1], 4),
+    }
+
+
+def resize_background(bg, world):
+    """Stretch a Background to a world size, so workloads do not depend on the image files."""
+    if bg.get_image_size() != world:
+        bg.image = pygame.transform.scale(bg.image, (world[0] // bg.scale, world[1] // bg.scale))
+        bg.image_width, bg.image_height = world
+        bg.clear_tiles()
+
+
+def fill_trash(trash_spawner, count, world, rng):
+    """
+    Put count trash in the world at once and keep the spawner at that count.
+    """
+    from catalogue import catalogue
+    trash_spawner.spawn_area_width, trash_spawner.spawn_area_height = world
+    trash_spawner.min_trash = trash_spawner.max_trash = count
+    while trash_spawner.trash_count() < count:
+        x = rng.randint(0, world[0] - 30)
+        y = rng.randint(0, world[1] - 30)
+        trash_spawner.add_trash(x, y, catalogue.choose(rng))
+
+
+class BenchmarkInput:
+    def __init__(self, frames, warmup, moving):
+        """
+        Feed App.run of main.py a fixed number of frames and time each of them.
+
+        It has the interface of replay.InputReplay, so the game loop runs
+        exactly as it does for a headless replay.
+
+        :param frames: Frames to measure.
+        :param warmup: Frames run first and not measured.
+        :param moving: Hold the arrow keys of ROUTE so the camera scrolls.
+        """
+        self.seed = 0
+        self.frames = 0
+        self.total = frames + warmup
+        self.warmup = warmup
+        self.moving = moving
+        self.frame_ms = 1000 // 60
+        self.last = None
+        self.frame_times = []
+        self.update_times = []
+        self.update_time = 0.0  # time in Gameplay.step during the current frame
+
+    def next_frame(self):
+        now = time.perf_counter()
+        if self.last is not None and self.frames > self.warmup:
+            self.frame_times.append(now - self.last)
+            self.update_times.append(self.update_time)
+        self.update_time = 0.0
+        if self.frames >= self.total:
+            return None
+        self.frames += 1
+        held = [ROUTE[self.frames // 120 % len(ROUTE)]] if self.moving else []
+        frame = InputFrame([], PressedKeys(held), (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2), (False, False, False), now)
+        self.last = time.perf_counter()
+        return frame, self.frame_ms
+
+
+def bench_state(state, frames, trash, world, backend="objects", warmup=30):
+    """
+    Run the real game loop of main.py in one state and time every frame.
+
+    Runs in its own process: App.run() quits pygame when it ends.
+
+    :return: Dictionary of result name -> summary.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):  # the game prints every collected trash
+        import main
+        from achievement import Achievement
+        from gameplay import Gameplay
+
+        source = BenchmarkInput(frames, warmup, moving=state in ("day1", "day2"))
+        step = Gameplay.step
+
+        def timed_step(self, keys, seconds):
+            started = time.perf_counter()
+            step(self, keys, seconds)
+            source.update_time += time.perf_counter() - started
+        Gameplay.step = timed_step
+
+        # No music, no videos, no frame pacing
+        app = main.App(main.parse_args(["--headless"] + BACKEND_FLAGS[backend]))
+        app.skip_video = True
+        app.replay = source
+        app.achievement = Achievement(os.path.join(tempfile.mkdtemp(), "achievements.jsonl"))  # the end screen saves
+        rng = random.Random(0)
+        for bg in (app.beach_bg, app.ocean_bg):
+            resize_background(bg, world)
+        fill_trash(app.trash_spawner, trash, world, rng)
+        app.total_score = 42
+        app.previous_state = "day1"
+        app.state = state
+        app.run()
+
+    name = f"state/{state}/trash={trash}/world={world[0]}x{world[1]}"
+    if backend != "objects":
+        name += f"/backend={backend}"
+    draw_times = [frame - update for frame, update in zip(source.frame_times, source.update_times)]
+    return {
+        f"{name}/frame": summarize(source.frame_times),
+        f"{name}/update": summarize(source.update_times),
+        f"{name}/draw": summarize(draw_times),
+    }
+
+
+def _bench_state_kwargs(kwargs):
+    return bench_state(**kwargs)
+
+
+def time_calls(function, calls, before=None):
+    """
+    Call a function once per argument tuple and time every call.
+
+    :param calls: List of argument tuples.
+    :param before: Optional function taking the call number, run before every call and not timed.
+    """
+    samples = []
+    for i, arguments in enumerate(calls):
+        if before:
+            before(i)
+        started = time.perf_counter()
+        function(*arguments)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def bench_micro(repeat, trash, world, backend="objects"):
+    """
+    Time single parts of a frame on a dummy display.
+
+    :return: Dictionary of result name -> summary.
+    """
+    from bg import Background
+    from char import Character
+    from simulate import QuietTrashInfo, SPAWNERS
+
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    rng = random.Random(0)
+    world_name = f"world={world[0]}x{world[1]}"
+    results = {}
+
+    bg = Background(os.path.join(resource_path, "beach.png"), SCREEN_WIDTH, SCREEN_HEIGHT)
+    resize_background(bg, world)
+    offsets = [(rng.randint(0, world[0]), rng.randint(0, world[1])) for _ in range(repeat)]
+    draw_calls = [(screen, x, y) for x, y in offsets]
+    # Scrolling a few pixels per frame like the game, almost every tile is in the cache
+    scroll_calls = [(screen, 5 * i % (world[0] - SCREEN_WIDTH), 3 * i % (world[1] - SCREEN_HEIGHT))
+                    for i in range(repeat)]
+    results[f"micro/Background.draw/{world_name}"] = summarize(time_calls(bg.draw, scroll_calls))
+    # Jumping to a random place every frame, every tile on screen has to be made
+    results[f"micro/Background.draw.cold/{world_name}"] = summarize(time_calls(bg.draw, draw_calls))
+
+    spawner_class = SPAWNERS[backend]
+    trash_spawner = spawner_class(*world, rng=random.Random(0))
+    spawner_name = spawner_class.__name__
+    fill_trash(trash_spawner, trash, world, rng)
+    character = Character(100, 100, os.path.join(resource_path, "character1.png"))
+    trash_info = QuietTrashInfo()
+
+    def move_camera(i):
+        fill_trash(trash_spawner, trash, world, rng)  # put back what the last call collected
+        trash_spawner.update_screen_offset(*offsets[i])
+    results[f"micro/{spawner_name}.check_collision/trash={trash}/{world_name}"] = summarize(
+        time_calls(trash_spawner.check_collision, [(character, trash_info)] * repeat, before=move_camera))
+    results[f"micro/{spawner_name}.draw/trash={trash}/{world_name}"] = summarize(
+        time_calls(trash_spawner.draw, draw_calls))
+
+    # Churn: every step despawns what expired and spawns as much again, trash lives one second
+    clock = [0]
+    churn_spawner = spawner_class(*world, clock=lambda: clock[0], rng=random.Random(0))
+    churn_spawner.spawn_delay = 0
+    churn_spawner.despawn_time = 1000
+
+    def churn_step():
+        clock[0] += 1000 // 60
+        churn_spawner.despawn_expired()
+        churn_spawner.spawn_trash()
+    for i in range(1, 121):  # fill over one lifetime, so about 1/60 of the trash expires per step
+        churn_spawner.min_trash = churn_spawner.max_trash = trash * min(i, 60) // 60
+        churn_step()
+    results[f"micro/{spawner_name}.churn/trash={trash}/{world_name}"] = summarize(
+        time_calls(churn_step, [()] * repeat))
+    return results
+
+
+def bench_start_screen(repeat):
+    """Time StartScreen.draw, which does not depend on the world."""
+    from start import StartScreen
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    start_screen = StartScreen(SCREEN_WIDTH, SCREEN_HEIGHT)
+    return {"micro/StartScreen.draw": summarize(time_calls(start_screen.draw, [(screen,)] * repeat))}
+
+
+def bench_startup(runs):
+    """
+    Start the game in a new process until its first frame, with and without the asset pack.
+
+    The pack is baked fresh into a temporary folder, so the run measures
+    the current images and leaves the source tree as it was.
+
+    :return: Dictionary of result name -> summary.
+    """
+    from atlas import bake
+    pack_dir = tempfile.mkdtemp()
+    pack_path = os.path.join(pack_dir, "assets.pack")
+    bake(pack_path)
+    main_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+    results = {}
+    try:
+        for name, flags in (("pack", ["--pack", pack_path]), ("image_files", ["--no-pack"])):
+            first_frame = []
+            process = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                output = subprocess.run([sys.executable, main_path, "--headless", "--startup-time"] + flags,
+                                        cwd=pack_dir, capture_output=True, text=True, check=True).stdout
+                process.append(time.perf_counter() - started)
+                # "First frame after 163.2 ms (pack)", counted from the top of main.py
+                first_frame.append(float(output.split("First frame after ")[1].split()[0]) / 1000)
+            results[f"startup/{name}/first_frame"] = summarize(first_frame)
+            results[f"startup/{name}/process"] = summarize(process)  # interpreter start to exit
+    finally:
+        shutil.rmtree(pack_dir, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Print how every result moved against a baseline.
+
+    :param threshold: Allowed p95 growth, 0.1 is 10 percent.
+    :return: List of names whose p95 got slower than allowed.
+    """
+    regressions = []
+    print(f"{'benchmark':70} {'base p95':>9} {'p95':>9} {'change':>8}")
+    for name, summary in results.items():
+        if name not in baseline:
+            print(f"{name:70} {'-':>9} {summary['p95']:9.3f} {'new':>8}")
+            continue
+        base = baseline[name]["p95"]
+        change = summary["p95"] / base - 1 if base else 0.0
+        mark = ""
+        if change > threshold:
+            regressions.append(name)
+            mark = "  SLOWER"
+        print(f"{name:70} {base:9.3f} {summary['p95']:9.3f} {change:+8.1%}{mark}")
+    return regressions
+
+
+def _int_list(text):
+    return [int(value) for value in text.split(",")]
+
+
+def _size_list(text):
+    return [tuple(int(part) for part in size.split("x")) for size in text.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame time benchmarks, p50/p95/p99 in milliseconds.")
+    parser.add_argument("--frames", type=int, default=300, help="measured frames per state")
+    parser.add_argument("--repeat", type=int, default=500, help="calls per micro benchmark")
+    parser.add_argument("--trash", type=_int_list, default=[30, 300], help="trash counts, e.g. 30,300")
+    parser.add_argument("--world", type=_size_list, default=[(5760, 3240)], help="world sizes, e.g. 5760x3240,2400x1800")
+    parser.add_argument("--backend", type=lambda text: text.split(","), default=["objects"],
+                        help="trash storage: objects, arrays, chunks or a list like objects,chunks")
+    parser.add_argument("--states", default=",".join(STATES), help="states to run, empty for none")
+    parser.add_argument("--no-micro", action="store_true", help="skip the micro benchmarks")
+    parser.add_argument("--startup", type=int, default=5, help="game starts to time, 0 to skip")
+    parser.add_argument("--out", default="benchmark.json", help="JSON file with the results")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare with an earlier --out file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed p95 growth for --compare")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = {}
+    states = [state for state in args.states.split(",") if state]
+    jobs = [dict(state=state, frames=args.frames, trash=trash, world=world, backend=backend)
+            for state in states for trash in args.trash for world in args.world for backend in args.backend]
+    # One fresh process per run, one at a time so runs do not slow each other down
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+                             max_tasks_per_child=1) as pool:
+        for result in pool.map(_bench_state_kwargs, jobs):
+            results.update(result)
+
+    if args.startup:
+        results.update(bench_startup(args.startup))
+
+    if not args.no_micro:
+        pygame.init()
+        results.update(bench_start_screen(args.repeat))
+        for trash in args.trash:
+            for world in args.world:
+                for backend in args.backend:
+                    results.update(bench_micro(args.repeat, trash, world, backend))
+        pygame.quit()
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "frames": args.frames,
+            "repeat": args.repeat,
+            "seconds": round(time.perf_counter() - started, 1),
+        },
+        "results": results,
+    }
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) more than {args.threshold:.0%} slower at p95")
+            sys.exit(1)
+    else:
+        for name, summary in results.items():
+            print(f"{name:70} p50 {summary['p50']:8.3f}  p95 {summary['p95']:8.3f}  p99 {summary['p99']:8.3f} ms")
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,88 @@
 import pygame
+from collections import OrderedDict
+from assets import assets
 
 class Background:
-    def __init__(self, image_path, width, height):
+    def __init__(self, image_path, width, height, scale=3, tile_size=128, cache_tiles=32, prefetch_per_frame=2):
         """
         Initialize the background.
 
+        The image is zoomed in by scale, but the zoomed image is never made
+        as a whole. It is cut into tiles that are scaled the first time the
+        camera needs them and kept in a small least-recently-used cache, so
+        the memory used does not grow with the size of the world. While the
+        camera moves, a few tiles just ahead of it are made in advance.
+
         :param image_path: Path to the background image file.
         :param width: Width of the screen.
         :param height: Height of the screen.
+        :param scale: Zoom factor of the image.
+        :param tile_size: Width and height of a tile in image pixels, tile_size * scale on screen.
+        :param cache_tiles: Most scaled tiles kept, at least the number that covers the screen.
+        :param prefetch_per_frame: Most tiles made ahead of the camera per frame.
         """
-        self.image = pygame.image.load(image_path)
-
-        # Zoom in the background image by a factor of 3
-        self.image_width = self.image.get_width() * 3   
-        self.image_height = self.image.get_height() * 3   
+        # Scaling a converted image keeps the display pixel format, so blits are plain copies
+        self.image = assets.image(image_path, alpha=False)
+        self.scale = scale
 
-        self.image = pygame.transform.scale(self.image, (self.image_width, self.image_height))
+        # Size of the zoomed image, the world the camera moves over
+        self.image_width = self.image.get_width() * scale
+        self.image_height = self.image.get_height() * scale
         self.width = width
         self.height = height
 
+        self.tile_size = tile_size
+        self.cache_tiles = cache_tiles
+        self.prefetch_per_frame = prefetch_per_frame
+        self.tiles = OrderedDict()  # (tile x, tile y) -> scaled Surface, least recently used first
+        self.last_offset = None  # camera of the previous draw, to know where it is heading
+
+    def _tile(self, tx, ty):
+        """Return a scaled tile, making it if it is not in the cache."""
+        key = (tx, ty)
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+            return tile
+        area = pygame.Rect(tx * self.tile_size, ty * self.tile_size, self.tile_size, self.tile_size)
+        area = area.clip(self.image.get_rect())  # tiles at the right and bottom edge can be smaller
+        tile = pygame.transform.scale(self.image.subsurface(area), (area.width * self.scale, area.height * self.scale))
+        tile.set_alpha(None)  # opaque, even when the image came from the pack with an alpha byte
+        self.tiles[key] = tile
+        if len(self.tiles) > self.cache_tiles:
+            self.tiles.popitem(last=False)
+        return tile
+
+    def _tile_keys(self, x, y, width, height):
+        """Return the tiles covering an area of the zoomed image, wrapping around its edges."""
+        size = self.tile_size * self.scale
+        columns = -(-self.image_width // size)
+        rows = -(-self.image_height // size)
+        return [(tx % columns, ty % rows)
+                for ty in range(y // size, (y + height - 1) // size + 1)
+                for tx in range(x // size, (x + width - 1) // size + 1)]
+
+    def prefetch(self, offset_x, offset_y):
+        """
+        Make the tiles the camera is about to reach, a few per frame, so
+        crossing into them does not cost a frame several tile scalings.
+        """
+        if self.last_offset is not None:
+            dx = offset_x - self.last_offset[0]
+            dy = offset_y - self.last_offset[1]
+            if dx or dy:
+                size = self.tile_size * self.scale
+                ahead_x = offset_x + (size if dx > 0 else -size if dx < 0 else 0)
+                ahead_y = offset_y + (size if dy > 0 else -size if dy < 0 else 0)
+                made = 0
+                for key in self._tile_keys(ahead_x, ahead_y, self.width, self.height):
+                    if made >= self.prefetch_per_frame:
+                        break
+                    if key not in self.tiles:
+                        self._tile(*key)
+                        made += 1
+        self.last_offset = (offset_x, offset_y)
+
     def draw(self, screen, offset_x, offset_y):
         """
         Draw the background on the screen with the calculated offset.
@@ -27,11 +91,30 @@ class Background:
         :param offset_x: The horizontal offset for the scrolling background.
         :param offset_y: The vertical offset for the scrolling background.
         """
-        # Only draw the parts of the background that are within the screen bounds
-        for x in range(0, self.width, self.image_width):
-            for y in range(0, self.height, self.image_height):
-                # Draw the parts of the background according to the offset x and y
-                screen.blit(self.image, (x - offset_x % self.image_width, y - offset_y % self.image_height))
+        # Only copy the visible part of every tile under the screen, wrapping around
+        # when the view crosses the image edge, so at most width x height pixels are blitted
+        size = self.tile_size * self.scale
+        source_y = offset_y % self.image_height
+        dest_y = 0
+        while dest_y < self.height:
+            ty = source_y // size
+            part_height = min(size - source_y % size, self.image_height - source_y, self.height - dest_y)
+            source_x = offset_x % self.image_width
+            dest_x = 0
+            while dest_x < self.width:
+                tx = source_x // size
+                part_width = min(size - source_x % size, self.image_width - source_x, self.width - dest_x)
+                screen.blit(self._tile(tx, ty), (dest_x, dest_y),
+                            (source_x % size, source_y % size, part_width, part_height))
+                dest_x += part_width
+                source_x = (source_x + part_width) % self.image_width
+            dest_y += part_height
+            source_y = (source_y + part_height) % self.image_height
+        self.prefetch(offset_x, offset_y)
+
+    def clear_tiles(self):
+        """Forget every scaled tile, e.g. after the image was replaced."""
+        self.tiles.clear()
 
     def get_image_size(self):
         """
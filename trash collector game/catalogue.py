@@ -0,0 +1,82 @@
+import bisect
+import json
+import os
+
+resource_path = os.path.join(os.path.dirname(__file__), "resource")
+CATALOGUE_PATH = os.path.join(resource_path, "trash.json")
+
+# Keys every entry of the file must have, the rest have defaults
+REQUIRED = ("id", "image")
+DEFAULTS = {"points": 1, "weight": 1, "name": ""}
+
+
+class TrashCatalogue:
+    def __init__(self, path=CATALOGUE_PATH, folder=resource_path):
+        """
+        Load the trash types from a JSON file, once.
+
+        The file is {"trash": [{"id": 1, "image": "trash1.png", "points": 1,
+        "weight": 1, "name": "..."}, ...]}. The description of a type is
+        printed on its card image. Adding a type only means adding an entry
+        (and its image), nothing in the code has to change.
+
+        :param path: The JSON file.
+        :param folder: Folder that image file names are looked up in.
+        :raises OSError: The file cannot be read.
+        :raises ValueError: The file is not valid JSON, an entry misses a key or an id is used twice.
+        """
+        self.path = path
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = json.load(f)["trash"]
+
+        self.types = []  # dictionaries in file order, shared with every Trash of that type
+        self.by_id = {}  # id -> dictionary
+        self.index_of = {}  # id -> position in types
+        for entry in entries:
+            missing = [key for key in REQUIRED if key not in entry]
+            if missing:
+                raise ValueError(f"{path}: trash entry {entry} has no {', '.join(missing)}")
+            if entry["id"] in self.by_id:
+                raise ValueError(f"{path}: trash id {entry['id']} is used twice")
+            info = dict(DEFAULTS, **entry)
+            info["image"] = os.path.join(folder, entry["image"])
+            self.index_of[info["id"]] = len(self.types)
+            self.by_id[info["id"]] = info
+            self.types.append(info)
+        if not self.types:
+            raise ValueError(f"{path} has no trash types")
+
+        # Running totals of the weights, so a weighted pick is a binary search
+        self.cum_weights = []
+        total = 0
+        for info in self.types:
+            total += info["weight"]
+            self.cum_weights.append(total)
+        self.uniform = all(info["weight"] == self.types[0]["weight"] for info in self.types)
+
+    def get(self, trash_id):
+        """Return the dictionary of a trash type, or None if there is no such id."""
+        return self.by_id.get(trash_id)
+
+    def choose(self, rng):
+        """
+        Pick a random trash type, types with a larger weight more often.
+
+        With equal weights this is rng.choice(types), so it uses the random
+        numbers the game always used and recorded replays still match.
+
+        :param rng: random.Random (or the random module).
+        :return: The dictionary of the type.
+        """
+        if self.uniform:
+            return rng.choice(self.types)
+        return self.types[bisect.bisect(self.cum_weights, rng.random() * self.cum_weights[-1])]
+
+    def __len__(self):
+        return len(self.types)
+
+    def __iter__(self):
+        return iter(self.types)
+
+
+catalogue = TrashCatalogue()
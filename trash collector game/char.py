@@ -1,17 +1,19 @@
 import pygame
-from PIL import Image
+from assets import assets
 
 class Character:
+    scale_factor = 3  # the image file is drawn this many times smaller
+
     def __init__(self, x, y, image_path, SCREEN_WIDTH=800, SCREEN_HEIGHT=600):
         #create character at position (x, y) with image from image_path
         self.x = x
         self.y = y
+        self.prev_x = x  # position before the last simulation step, for render interpolation
+        self.prev_y = y
         self.image_path = image_path
-        self.original_image = pygame.image.load(image_path)
-        scale_factor = 3
-        new_width = self.original_image.get_width() // scale_factor
-        new_height = self.original_image.get_height() // scale_factor
-        self.image = pygame.transform.scale(self.original_image, (new_width, new_height))
+        width, height = assets.image_size(image_path)
+        # Shared scaled image, flip_image() makes a new Surface instead of drawing onto it
+        self.image = assets.image(image_path, size=(width // self.scale_factor, height // self.scale_factor))
         self.rect = self.image.get_rect(topleft=(x, y))
 
         # Basic speed for each direction
@@ -33,14 +35,25 @@ class Character:
         # Variable to track facing direction
         self.facing_right = True  # Default facing right
 
-    def draw(self, screen):
-        screen.blit(self.image, (self.x, self.y))
+    def draw(self, screen, alpha=1.0):
+        """
+        Draw the character between its previous and current position.
+
+        :param alpha: 0 draws the position before the last simulation step, 1 the current one.
+        :return: The area of the screen drawn on.
+        """
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        return screen.blit(self.image, (round(x), round(y)))
 
     def move(self, dx, dy, SCREEN_WIDTH, SCREEN_HEIGHT, is_display_moving=False, screen_center=None, screen_bounds=None):
         """
         Move the character with 4 independent directions.
         screen_bounds: (is_at_left, is_at_right, is_at_top, is_at_bottom)
+        Call once per simulation step, also when not moving, so the previous position stays current.
         """
+        self.prev_x = self.x
+        self.prev_y = self.y
         if dx != 0 or dy != 0:
             final_dx = final_dy = 0
             
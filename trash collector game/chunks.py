@@ -0,0 +1,172 @@
+import random
+from spawn import TrashSpawner
+from catalogue import catalogue
+
+
+class WorldChunk:
+    # A large map has many chunks
+    __slots__ = ("x", "y", "width", "height", "trash", "next_spawn", "rng")
+
+    def __init__(self, x, y, width, height, next_spawn, rng):
+        """
+        One square of the world with its own trash and spawn timer.
+
+        :param x: World x of the left edge.
+        :param y: World y of the top edge.
+        :param width: Width in pixels, smaller than the chunk size at the right edge of the world.
+        :param height: Height in pixels, smaller at the bottom edge.
+        :param next_spawn: Clock time in milliseconds of the first spawn tick.
+        :param rng: random.Random used only by this chunk.
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.trash = {}  # Trash -> spawn time, in spawn order so the oldest is first
+        self.next_spawn = next_spawn
+        self.rng = rng
+
+
+class ChunkedTrashSpawner(TrashSpawner):
+    def __init__(self, spawn_area_width=800, spawn_area_height=600, max_trash=30, data_book=None, clock=None,
+                 rng=None, chunk_size=1024, active_margin=512, view_width=800, view_height=600):
+        """
+        TrashSpawner that splits the world into chunks and only simulates the ones near the camera.
+
+        Every chunk spawns and despawns its own share of min_trash and
+        max_trash, by area. Chunks in the view or within active_margin of it
+        are updated every step; the others sleep and are caught up when the
+        camera comes near again. Catching up replays at most the last
+        despawn_time of spawn ticks, anything older would be gone anyway.
+        Drawing only asks the grid for the trash in view, so a frame costs
+        the same on a small or a huge map.
+
+        :param chunk_size: Width and height of a chunk in pixels.
+        :param active_margin: How far around the view chunks are awake, in pixels.
+        :param view_width: Width of the screen the camera shows.
+        :param view_height: Height of the screen the camera shows.
+        """
+        super().__init__(spawn_area_width, spawn_area_height, max_trash, data_book, clock, rng)
+        self.chunk_size = chunk_size
+        self.active_margin = active_margin
+        self.view_width = view_width
+        self.view_height = view_height
+        self.world_seed = self.rng.getrandbits(64)  # a chunk gets the same trash whatever route woke it
+        self.chunks = {}  # (cx, cy) -> WorldChunk, made the first time the camera comes near
+        self.trash_chunk = {}  # Trash -> WorldChunk it belongs to
+
+    def reseed(self, seed):
+        """
+        Seed the random numbers and start the world over from them.
+
+        The world seed is drawn again after seeding, and the chunks made so
+        far (and their trash) are dropped, so every chunk is made from the
+        new seed when the camera comes near.
+        """
+        super().reseed(seed)
+        self.world_seed = self.rng.getrandbits(64)
+        for trash in list(self.trash_chunk):
+            self.remove_trash(trash)
+        self.chunks.clear()
+
+    def _chunk(self, cx, cy):
+        chunk = self.chunks.get((cx, cy))
+        if chunk is None:
+            x, y = cx * self.chunk_size, cy * self.chunk_size
+            chunk = self.chunks[(cx, cy)] = WorldChunk(
+                x, y, min(self.chunk_size, self.spawn_area_width - x), min(self.chunk_size, self.spawn_area_height - y),
+                self.clock(), random.Random(f"{self.world_seed}/{cx}/{cy}"))
+        return chunk
+
+    def active_chunks(self):
+        """Return the chunks in or near the view, the only ones simulated this step."""
+        size = self.chunk_size
+        left = max(0, self.screen_offset_x - self.active_margin) // size
+        top = max(0, self.screen_offset_y - self.active_margin) // size
+        right = min(self.spawn_area_width - 1, self.screen_offset_x + self.view_width + self.active_margin) // size
+        bottom = min(self.spawn_area_height - 1, self.screen_offset_y + self.view_height + self.active_margin) // size
+        return [self._chunk(cx, cy) for cy in range(top, bottom + 1) for cx in range(left, right + 1)]
+
+    def _share(self, chunk, count):
+        """
+        Part of a whole-world trash count that falls on one chunk, by area. The
+        fraction is rounded up or down at random, so over many chunks the
+        world holds as much trash as the count says.
+        """
+        share = count * chunk.width * chunk.height / (self.spawn_area_width * self.spawn_area_height)
+        whole = int(share)
+        return whole + (chunk.rng.random() < share - whole)
+
+    def spawn_trash(self, count=1):
+        now = self.clock()
+        for chunk in self.active_chunks():
+            self._catch_up(chunk, now)
+
+    def _catch_up(self, chunk, now):
+        """
+        Run the spawn ticks a chunk missed, oldest first, and despawn what expired in between.
+        Like in the other spawners, nothing disappears while the info box is shown.
+        """
+        delay = max(1, self.spawn_delay)
+        expire = not self.display_info
+        if self.despawn_time is not None and chunk.next_spawn < now - self.despawn_time:
+            # Slept longer than trash lives: what those ticks spawned would be gone by now
+            chunk.next_spawn += (now - self.despawn_time - chunk.next_spawn) // delay * delay
+        while chunk.next_spawn <= now:
+            if expire:
+                self._despawn_chunk(chunk, chunk.next_spawn)
+            self._spawn_tick(chunk, chunk.next_spawn)
+            chunk.next_spawn += delay
+        if expire:
+            self._despawn_chunk(chunk, now)
+
+    def _spawn_tick(self, chunk, spawn_time):
+        """The rule of TrashSpawner.spawn_trash, with the share of the chunk and its own random numbers."""
+        rng = chunk.rng
+        maximum = self._share(chunk, self.max_trash)
+        needed = max(0, self._share(chunk, self.min_trash) - len(chunk.trash))
+        for _ in range(rng.randint(needed, needed + 3)):
+            if len(chunk.trash) < maximum:
+                x = min(rng.randint(chunk.x, chunk.x + chunk.width - 1), self.spawn_area_width - 30)
+                y = min(rng.randint(chunk.y, chunk.y + chunk.height - 1), self.spawn_area_height - 30)
+                self._add_to_chunk(chunk, x, y, catalogue.choose(rng), spawn_time)
+
+    def add_trash(self, x, y, info):
+        self._add_to_chunk(self._chunk(x // self.chunk_size, y // self.chunk_size), x, y, info, self.clock())
+
+    def _add_to_chunk(self, chunk, x, y, info, spawn_time):
+        trash = self._take_trash(x, y, info)
+        self.trash_list.insert(trash, x, y, trash.width, trash.height)
+        chunk.trash[trash] = spawn_time
+        self.trash_chunk[trash] = chunk
+        if self.record_changes:
+            self.changed_rects.append(trash.get_image_rect())
+
+    def remove_trash(self, trash):
+        del self.trash_chunk.pop(trash).trash[trash]
+        super().remove_trash(trash)
+
+    def _despawn_chunk(self, chunk, now):
+        """Remove the trash of a chunk spawned despawn_time or longer before now, oldest first."""
+        if self.despawn_time is None:
+            return 0
+        oldest = now - self.despawn_time
+        removed = 0
+        while chunk.trash:
+            trash, spawn_time = next(iter(chunk.trash.items()))
+            if spawn_time > oldest:
+                break
+            self.remove_trash(trash)
+            removed += 1
+        return removed
+
+    def despawn_expired(self):
+        now = self.clock()
+        return sum(self._despawn_chunk(chunk, now) for chunk in self.active_chunks())
+
+    def draw(self, screen, offset_x=0, offset_y=0, beach=True):
+        """
+        Draw the trash in view, found through the grid instead of going over all trash.
+        """
+        for trash in self.trash_list.query(offset_x, offset_y, screen.get_width() + 1, screen.get_height() + 1):
+            trash.draw(screen, offset_x, offset_y)
@@ -1,4 +1,6 @@
 import pygame
+from fonts import get_font, render_text
+from gradient import get_gradient, MENU_GRADIENT
 
 class FinishScreen:
     def __init__(self, screen_width, screen_height):
@@ -11,19 +13,13 @@ class FinishScreen:
         )
 
     def draw(self, screen, total_score):
-        # Draw gradient background
-        for i in range(self.screen_height):
-            color = (
-                int(135 * (1 - i/self.screen_height)),
-                int(206 * (1 - i/self.screen_height)),
-                int(250 * (1 - i/self.screen_height))
-            )
-            pygame.draw.line(screen, color, (0, i), (self.screen_width, i))
+        # Draw gradient background, built once per screen size
+        screen.blit(get_gradient((self.screen_width, self.screen_height), MENU_GRADIENT), (0, 0))
 
         # Draw "Game Over!" with shadow effect
-        title_font = pygame.font.Font(pygame.font.match_font('Tahoma'), 72)
-        title_shadow = title_font.render("Game Over!", True, (0, 0, 0))
-        title_text = title_font.render("Game Over!", True, (255, 255, 255))
+        title_font = get_font('Tahoma', 72)
+        title_shadow = render_text("Game Over!", title_font, (0, 0, 0))
+        title_text = render_text("Game Over!", title_font, (255, 255, 255))
 
         title_x = self.screen_width // 2 - title_text.get_width() // 2
         title_y = self.screen_height // 5
@@ -32,8 +28,8 @@ class FinishScreen:
         screen.blit(title_text, (title_x, title_y))
 
         # Display score
-        score_font = pygame.font.Font(pygame.font.match_font('Tahoma'), 48)
-        score_text = score_font.render(f"Total Score: {total_score}", True, (0, 100, 0))
+        score_font = get_font('Tahoma', 48)
+        score_text = render_text(f"Total Score: {total_score}", score_font, (0, 100, 0))
         score_pos = (self.screen_width // 2 - score_text.get_width() // 2, 
                     self.screen_height // 2)
         screen.blit(score_text, score_pos)
@@ -45,16 +41,12 @@ class FinishScreen:
         pygame.draw.rect(screen, button_color, self.play_again_button, border_radius=15)
         pygame.draw.rect(screen, (255, 255, 255), self.play_again_button, 3, border_radius=15)
         
-        button_font = pygame.font.Font(pygame.font.match_font('Tahoma'), 40)
-        button_text = button_font.render("Play Again", True, (255, 255, 255))
+        button_font = get_font('Tahoma', 40)
+        button_text = render_text("Play Again", button_font, (255, 255, 255))
         text_pos = (self.play_again_button.centerx - button_text.get_width() // 2,
                    self.play_again_button.centery - button_text.get_height() // 2)
         screen.blit(button_text, text_pos)
 
-        pygame.display.flip()
-
-    def check_play_again(self):
-        """Check if the play again button was clicked"""
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_clicked = pygame.mouse.get_pressed()[0]  # Left click
-        return self.play_again_button.collidepoint(mouse_pos) and mouse_clicked
+    def check_play_again(self, frame):
+        """Check if the play again button was clicked this frame (left click)"""
+        return frame.clicked(self.play_again_button)
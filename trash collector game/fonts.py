@@ -0,0 +1,91 @@
+import pygame
+from collections import OrderedDict
+
+_fonts = {}  # (family, size) -> pygame Font
+
+
+def get_font(family="Tahoma", size=24):
+    """
+    Get a font, looking it up and loading it only the first time.
+
+    :param family: Font family name, or None for the pygame default font.
+    :param size: Font size in points.
+    :return: A shared pygame Font object.
+    """
+    key = (family, size)
+    font = _fonts.get(key)
+    if font is None:
+        font_path = pygame.font.match_font(family) if family else None
+        font = pygame.font.Font(font_path, size)
+        _fonts[key] = font
+    return font
+
+
+class TextCache:
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        """
+        Initialize an LRU cache of rendered text surfaces.
+
+        :param max_bytes: Memory cap for all cached surfaces together.
+        """
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()  # (text, font, color, antialias) -> Surface
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, font, color, antialias=True):
+        """
+        Render text, reusing the surface from an earlier call when possible.
+
+        :param text: The string to render.
+        :param font: A pygame Font, preferably one from get_font().
+        :param color: RGB tuple of the text colour.
+        :param antialias: Whether to antialias the text.
+        :return: The rendered Surface. It is shared, so do not draw onto it.
+        """
+        key = (text, font, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        size = surface.get_pitch() * surface.get_height()
+        self.surfaces[key] = surface
+        self.used_bytes += size
+
+        # Drop the least recently used surfaces until we are back under the cap
+        while self.used_bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, old = self.surfaces.popitem(last=False)
+            self.used_bytes -= old.get_pitch() * old.get_height()
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.used_bytes = 0
+
+    def stats(self):
+        """
+        Return cache counters, useful to check that a screen stops allocating.
+
+        :return: Dictionary with hits, misses, entries and bytes.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.surfaces),
+            "bytes": self.used_bytes,
+        }
+
+
+text_cache = TextCache()
+
+
+def render_text(text, font, color, antialias=True):
+    """
+    Render text through the shared text cache.
+    """
+    return text_cache.render(text, font, color, antialias)
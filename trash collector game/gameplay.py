@@ -0,0 +1,127 @@
+import pygame
+from profiler import profiler
+
+# speed settings, in pixels per simulation step
+SCREEN_SPEED_X = 5  # Horizontal display movement speed
+SCREEN_SPEED_Y = 5  # Vertical display movement speed
+
+
+class Gameplay:
+    def __init__(self, character, trash_spawner, trash_info, timer, world_width, world_height,
+                 screen_width=800, screen_height=600):
+        """
+        Initialize the simulation of one game: camera, character, trash and timer.
+
+        It has no drawing and no display code, so the same rules run in the
+        game window and in headless runs (see simulate.py).
+
+        :param character: The Character the player controls.
+        :param trash_spawner: The TrashSpawner of this game.
+        :param trash_info: TrashInfo that collected trash is reported to.
+        :param timer: The Tyme of the current day.
+        :param world_width: Width of the (scaled) background the camera moves over.
+        :param world_height: Height of the (scaled) background.
+        :param screen_width: Width of the screen.
+        :param screen_height: Height of the screen.
+        """
+        self.character = character
+        self.trash_spawner = trash_spawner
+        self.trash_info = trash_info
+        self.timer = timer
+        self.world_width = world_width
+        self.world_height = world_height
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.screen_offset_x = 0
+        self.screen_offset_y = 0
+        self.previous_offset_x = 0  # camera before the last step, for render interpolation
+        self.previous_offset_y = 0
+
+    def get_screen_bounds(self):
+        """Return (is_at_left, is_at_right, is_at_top, is_at_bottom) for the camera."""
+        return (
+            self.screen_offset_x <= 0,
+            self.screen_offset_x >= self.world_width - self.screen_width,
+            self.screen_offset_y <= 0,
+            self.screen_offset_y >= self.world_height - self.screen_height
+        )
+
+    def get_draw_offset(self, alpha=1.0):
+        """
+        Return the camera offset to draw with, between the last two steps.
+
+        :param alpha: 0 for the offset before the last step, 1 for the current one.
+        """
+        return (
+            round(self.previous_offset_x + (self.screen_offset_x - self.previous_offset_x) * alpha),
+            round(self.previous_offset_y + (self.screen_offset_y - self.previous_offset_y) * alpha)
+        )
+
+    def step(self, keys, seconds):
+        """
+        Advance the game by one fixed simulation step.
+
+        :param keys: Held keys, indexable by pygame key constants like pygame.key.get_pressed().
+        :param seconds: Length of one simulation step.
+        """
+        character = self.character
+        trash_spawner = self.trash_spawner
+        self.previous_offset_x = self.screen_offset_x
+        self.previous_offset_y = self.screen_offset_y
+
+        # The display does not move while the trash info box is open
+        speed_x = 0 if trash_spawner.display_info else SCREEN_SPEED_X
+        speed_y = 0 if trash_spawner.display_info else SCREEN_SPEED_Y
+
+        screen_is_moving = False
+        screen_movement = [0, 0]  # [dx, dy] for display screen
+
+        if keys[pygame.K_LEFT] and self.screen_offset_x > 0:
+            screen_movement[0] = -speed_x
+            screen_is_moving = True
+        elif keys[pygame.K_RIGHT] and self.screen_offset_x < self.world_width - self.screen_width:
+            screen_movement[0] = speed_x
+            screen_is_moving = True
+
+        if keys[pygame.K_UP] and self.screen_offset_y > 0:
+            screen_movement[1] = -speed_y
+            screen_is_moving = True
+        elif keys[pygame.K_DOWN] and self.screen_offset_y < self.world_height - self.screen_height:
+            screen_movement[1] = speed_y
+            screen_is_moving = True
+
+        screen_center = (self.screen_width // 2, self.screen_height // 2)
+        if screen_is_moving:
+            char_pos = character.get_center()
+            on_y_axis, on_x_axis = character.check_axis_alignment(char_pos, screen_center)
+
+            if not on_y_axis:
+                screen_movement[0] = 0
+            if not on_x_axis:
+                screen_movement[1] = 0
+
+            self.screen_offset_x += screen_movement[0]
+            self.screen_offset_y += screen_movement[1]
+
+        dx = dy = 0
+        if keys[pygame.K_LEFT]: dx = -1
+        if keys[pygame.K_RIGHT]: dx = 1
+        if keys[pygame.K_UP]: dy = -1
+        if keys[pygame.K_DOWN]: dy = 1
+
+        if screen_is_moving:
+            character.move(dx, dy, self.screen_width, self.screen_height,
+                           is_display_moving=True,
+                           screen_center=screen_center,
+                           screen_bounds=self.get_screen_bounds())
+        else:
+            character.move(dx, dy, self.screen_width, self.screen_height)
+
+        trash_spawner.update_screen_offset(self.screen_offset_x, self.screen_offset_y)
+        with profiler.scope("spawn"):
+            if not trash_spawner.display_info:  # nothing disappears while the player reads about a trash
+                trash_spawner.despawn_expired()
+            trash_spawner.spawn_trash(count=1)  # spawns every trash_spawner.spawn_delay ms of simulation time
+        with profiler.scope("collision"):
+            trash_spawner.check_collision(character, self.trash_info)
+        self.timer.tick(seconds, trash_spawner.display_info)
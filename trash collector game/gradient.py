@@ -0,0 +1,52 @@
+import numpy as np
+import pygame
+
+# Sky blue at the top fading to black at the bottom, used by the menu screens
+MENU_GRADIENT = ((135, 206, 250), (0, 0, 0))
+
+_gradients = {}  # (size, stops) -> Surface
+
+
+def make_gradient(size, stops):
+    """
+    Build a vertical gradient surface with NumPy instead of one line per row.
+
+    :param size: Tuple (width, height) of the surface.
+    :param stops: Sequence of at least two RGB colours, spread evenly from top to bottom.
+    :return: A new pygame Surface.
+    """
+    width, height = size
+    colors = np.array(stops, dtype=np.float64)
+    segments = len(colors) - 1
+
+    # Position of every row between 0 (top) and 1 (bottom), split into segments
+    t = np.arange(height, dtype=np.float64) / height * segments
+    index = np.minimum(t.astype(np.intp), segments - 1)
+    local = (t - index)[:, None]
+    rows = colors[index] * (1 - local) + colors[index + 1] * local
+    rows = rows.astype(np.uint8)  # truncate like int() did
+
+    # surfarray is indexed [x][y], so repeat the row colours along x
+    pixels = np.broadcast_to(rows[None, :, :], (width, height, 3))
+    surface = pygame.surfarray.make_surface(np.ascontiguousarray(pixels))
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert()
+    return surface
+
+
+def get_gradient(size, stops=MENU_GRADIENT):
+    """
+    Get the cached gradient for a size, building it only on first use.
+
+    A new gradient is built only when the size (e.g. the window) changes.
+
+    :param size: Tuple (width, height) of the surface.
+    :param stops: Sequence of RGB colours from top to bottom.
+    :return: A shared pygame Surface, blit it but do not draw onto it.
+    """
+    key = (tuple(size), tuple(tuple(color) for color in stops))
+    surface = _gradients.get(key)
+    if surface is None:
+        surface = make_gradient(key[0], key[1])
+        _gradients[key] = surface
+    return surface
@@ -0,0 +1,78 @@
+class SpatialHash:
+    def __init__(self, cell_size=128):
+        """
+        Initialize a uniform grid index of items in world coordinates.
+
+        :param cell_size: Width and height of one grid cell in pixels.
+        """
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> {item: rect}
+        self.items = {}  # item -> (rect, list of cell keys), keeps insertion order
+
+    def _cell_range(self, x, y, width, height):
+        """Return the cell keys covered by a rectangle."""
+        size = self.cell_size
+        x0, y0 = x // size, y // size
+        x1, y1 = (x + width - 1) // size, (y + height - 1) // size
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+    def insert(self, item, x, y, width, height):
+        """
+        Add an item with its world rectangle to every cell it overlaps,
+        or move it if it is already in the grid.
+
+        :param item: Any hashable object.
+        """
+        if item in self.items:
+            self.remove(item)
+        rect = (x, y, width, height)
+        keys = self._cell_range(x, y, width, height)
+        for key in keys:
+            cell = self.cells.get(key)
+            if cell is None:
+                cell = self.cells[key] = {}
+            cell[item] = rect
+        self.items[item] = (rect, keys)
+
+    def remove(self, item):
+        """
+        Remove an item in constant time (only the few cells it covers are touched).
+        A cell is deleted with its last item, so memory follows the trash
+        that exists, not how much of the world has ever had some.
+        """
+        rect, keys = self.items.pop(item)
+        for key in keys:
+            cell = self.cells[key]
+            del cell[item]
+            if not cell:
+                del self.cells[key]
+
+    def query(self, x, y, width, height):
+        """
+        Return the items whose rectangle overlaps the given world rectangle.
+
+        :return: List of items, each listed once.
+        """
+        found = {}
+        right, bottom = x + width, y + height
+        for key in self._cell_range(x, y, width, height):
+            cell = self.cells.get(key)
+            if not cell:
+                continue
+            for item, (ix, iy, iw, ih) in cell.items():
+                if ix < right and x < ix + iw and iy < bottom and y < iy + ih:
+                    found[item] = True
+        return list(found)
+
+    def clear(self):
+        self.cells.clear()
+        self.items.clear()
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __contains__(self, item):
+        return item in self.items
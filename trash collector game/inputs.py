@@ -0,0 +1,162 @@
+import time
+from collections import deque
+import pygame
+
+
+class InputFrame:
+    def __init__(self, events, keys, mouse_pos, mouse_buttons, pumped_at):
+        """
+        Snapshot of the input of one frame.
+
+        :param events: All pygame events taken from the queue this frame.
+        :param keys: Key state from pygame.key.get_pressed().
+        :param mouse_pos: Mouse position.
+        :param mouse_buttons: Mouse button state from pygame.mouse.get_pressed().
+        :param pumped_at: time.perf_counter() when the queue was read.
+        """
+        self.events = events
+        self.keys = keys
+        self.mouse_pos = mouse_pos
+        self.mouse_buttons = mouse_buttons
+        self.pumped_at = pumped_at
+        self.quit = False
+        self.pressed = set()  # keys that went down this frame
+        self.released = set()  # keys that went up this frame
+        self.clicks = []  # (button, pos) of mouse buttons that went down this frame
+        self.mouse_releases = []  # (button, pos) of mouse buttons that went up this frame
+
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.quit = True
+            elif event.type == pygame.KEYDOWN:
+                self.pressed.add(event.key)
+            elif event.type == pygame.KEYUP:
+                self.released.add(event.key)
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                self.clicks.append((event.button, event.pos))
+            elif event.type == pygame.MOUSEBUTTONUP:
+                self.mouse_releases.append((event.button, event.pos))
+
+    def key_held(self, key):
+        """True while the key is down."""
+        return bool(self.keys[key])
+
+    def key_pressed(self, key):
+        """True only in the frame the key went down."""
+        return key in self.pressed
+
+    def key_released(self, key):
+        """True only in the frame the key went up."""
+        return key in self.released
+
+    def clicked(self, rect, button=1):
+        """
+        Check if a mouse button went down inside a rectangle this frame.
+
+        :param rect: A pygame Rect, e.g. a button.
+        :param button: Mouse button number, 1 is the left button.
+        """
+        return any(b == button and rect.collidepoint(pos) for b, pos in self.clicks)
+
+
+class EmptyKeys:
+    """Key state used before the first pump, every key is up."""
+    def __getitem__(self, key):
+        return False
+
+
+class PressedKeys:
+    """Stand-in for pygame.key.get_pressed() holding a fixed set of keys."""
+    def __init__(self, keys=()):
+        self.keys = set(keys)
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+
+class InputManager:
+    def __init__(self, latency_samples=600):
+        """
+        Initialize the input system.
+
+        The event queue is read once per frame by pump(). Everything else
+        reads the resulting InputFrame instead of calling pygame.event.get(),
+        so no event is lost because another part of the game drained the queue.
+
+        :param latency_samples: How many frames of latency measurements to keep.
+        """
+        self.frame = InputFrame([], EmptyKeys(), (0, 0), (False, False, False), time.perf_counter())
+        self.handlers = {}  # state -> list of handler functions
+        self.latencies = deque(maxlen=latency_samples)  # seconds, frames that had input only
+        self.last_pump = None
+        self.queue_wait = 0.0  # longest an event of this frame can have waited in the queue, seconds
+
+    def subscribe(self, state, handler):
+        """
+        Call a handler with the InputFrame every frame the game is in a state.
+
+        :param state: Game state name, or None for every state.
+        :param handler: Function taking an InputFrame.
+        """
+        self.handlers.setdefault(state, []).append(handler)
+
+    def pump(self):
+        """
+        Read the event queue. Call this exactly once per frame.
+
+        :return: The new InputFrame, also available as self.frame.
+        """
+        now = time.perf_counter()
+        self.frame = InputFrame(pygame.event.get(), pygame.key.get_pressed(),
+                                pygame.mouse.get_pos(), pygame.mouse.get_pressed(), now)
+        # An event may have arrived right after the previous pump, so it waited this long at most
+        self.queue_wait = now - self.last_pump if self.last_pump is not None else 0.0
+        self.last_pump = now
+        return self.frame
+
+    def feed(self, frame):
+        """
+        Use a frame that did not come from the event queue, e.g. one read from a replay.
+        Call this instead of pump().
+
+        :return: The frame, also available as self.frame.
+        """
+        self.frame = frame
+        self.queue_wait = 0.0
+        self.last_pump = frame.pumped_at
+        return self.frame
+
+    def dispatch(self, state):
+        """
+        Run the handlers subscribed to a state (and to every state) with this frame's input.
+        """
+        for handler in self.handlers.get(None, []) + self.handlers.get(state, []):
+            handler(self.frame)
+
+    def end_frame(self):
+        """
+        Record how long this frame's input took to be handled. Call after the frame's logic.
+        """
+        if self.frame.events:
+            handled = time.perf_counter() - self.frame.pumped_at
+            self.latencies.append(self.queue_wait + handled)
+
+    def latency_stats(self):
+        """
+        Return input-to-handling latency for recent frames that had input.
+
+        The latency counts the worst-case wait in the event queue (time since
+        the previous pump) plus the time until the frame's logic was done.
+
+        :return: Dictionary with frames, average_ms and max_ms.
+        """
+        if not self.latencies:
+            return {"frames": 0, "average_ms": 0.0, "max_ms": 0.0}
+        return {
+            "frames": len(self.latencies),
+            "average_ms": sum(self.latencies) / len(self.latencies) * 1000,
+            "max_ms": max(self.latencies) * 1000,
+        }
+
+
+inputs = InputManager()
@@ -1,46 +1,48 @@
-import pygame
+import argparse
 import os
-import cv2  
+import random
+import sys
+import time
+
+STARTED = time.perf_counter()  # for --startup-time
+
+# Every phase of the start is timed, from here to the first frame on screen
+from startup import StartupTrace
+startup_trace = StartupTrace(STARTED)
+
+import pygame
+startup_trace.mark("import pygame")
 from start import StartScreen
 from bg import Background
 from char import Character
 from tyme import Tyme
 from spawn import TrashSpawner
-from trashinfo import TrashInfo, DataBook, display_trash_info, hide_trash_info  
+from trashinfo import TrashInfo, DataBook, display_trash_info, hide_trash_info, trash_images
 from achievement import Achievement
 from finish import FinishScreen 
-
-pygame.init()
+from fonts import get_font, render_text, text_cache
+from assets import assets
+from render import DirtyRectRenderer
+from inputs import inputs
+from timestep import FixedTimestep
+from gameplay import Gameplay
+from replay import InputRecorder, InputReplay
+from profiler import profiler
+from atlas import PACK_PATH
+import audio as audio_engine
+from audio import audio
+startup_trace.mark("import game")
 
 # Screen dimensions
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 
-screen_info = pygame.display.Info()
-os_screen_width = screen_info.current_w
-os_screen_height = screen_info.current_h
-os.environ['SDL_VIDEO_WINDOW_POS'] = f"{(os_screen_width-SCREEN_WIDTH)//2},{(os_screen_height-SCREEN_HEIGHT)//2}"
-
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Ocean Cleanup Game")
-
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 
-bgm_path = os.path.join(os.path.dirname(__file__), "resource", "bgm.mp3")
-pygame.mixer.music.load(bgm_path)
-pygame.mixer.music.play(-1)  # Loop
-
-# Game components
-resource_path = os.path.join(os.path.dirname(__file__), "resource")
-start_screen = StartScreen(SCREEN_WIDTH, SCREEN_HEIGHT)
-beach_bg = Background(os.path.join(resource_path, "beach.png"), SCREEN_WIDTH, SCREEN_HEIGHT)
-ocean_bg = Background(os.path.join(resource_path, "ocean.png"), SCREEN_WIDTH, SCREEN_HEIGHT)
-timer = Tyme(3)  
-trash_info = TrashInfo()
-achievement = Achievement()
-finish_screen = FinishScreen(SCREEN_WIDTH, SCREEN_HEIGHT)  
-data_book = DataBook()  
+# Decode the images needed for the first frames in the background, the rest load when first used
+CRITICAL_ASSETS = ["beach.png", "ocean.png", "character1.png", "character2.png", "trashbag.png"]
+ASSET_REPORT_LINES = 10  # slowest asset loads printed by --startup-time
 
 # Game states
 STATE_START = "start"
@@ -48,243 +50,480 @@ STATE_DAY1 = "day1"
 STATE_DAY2 = "day2"
 STATE_END = "end"
 STATE_DATA_BOOK = "data_book"
-
-global character, trash_spawner, state, total_score, previous_state, skip_video
-character = Character(100, 100, os.path.join(resource_path, "character1.png"))
-trash_spawner = TrashSpawner(*beach_bg.get_image_size(), data_book=data_book)  # background size, data_book instance
-state = STATE_START
-previous_state = None  
-total_score = 0
-skip_video = False  
-
-def play_video(video_path):
-    cap = cv2.VideoCapture(video_path)
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        frame = pygame.surfarray.make_surface(frame)
-        frame = pygame.transform.rotate(frame, -90)
-        frame = pygame.transform.flip(frame, True, False)
-        frame = pygame.transform.scale(frame, (SCREEN_WIDTH, SCREEN_HEIGHT))  # limit video size to screen size
-        screen.blit(frame, (0, 0))
-        pygame.display.update()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                cap.release()
+STATE_ACHIEVEMENTS = "achievements"
+STATE_HELP = "help"
+
+# How long the help screen stays up, in frame time so replays see the same frames
+HELP_MS = 3000
+
+# Movement, spawning, collision and the timer advance in fixed steps of 1 / SIMULATION_RATE seconds
+SIMULATION_RATE = 60
+
+# How to ask for each trash backend on the command line
+BACKEND_OPTIONS = {"objects": "neither --array-trash nor --chunked-world", "arrays": "--array-trash",
+                   "chunks": "--chunked-world"}
+
+# Only push changed areas to the window while the camera stands still
+USE_DIRTY_RECTS = True
+
+# Sound effect played when the game goes from one state to another
+STATE_SOUNDS = {
+    (STATE_START, STATE_DAY1): "start",
+    (STATE_DAY1, STATE_DAY2): "day",
+    (STATE_DAY2, STATE_END): "finish",
+}
+for book_state in [STATE_START, STATE_DAY1, STATE_DAY2]:
+    STATE_SOUNDS[(book_state, STATE_DATA_BOOK)] = STATE_SOUNDS[(STATE_DATA_BOOK, book_state)] = "page"
+
+
+def parse_args(argv=None):
+    """
+    Read the command line options.
+
+    :param argv: Arguments without the program name, sys.argv[1:] if None.
+    :return: argparse.Namespace, unknown arguments are ignored.
+    """
+    parser = argparse.ArgumentParser(description="Ocean Cleanup Game")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the first game, random when not given")
+    parser.add_argument("--record", metavar="FILE", help="write the input of every frame to FILE")
+    parser.add_argument("--replay", metavar="FILE", help="play a recorded input log instead of reading the keyboard")
+    parser.add_argument("--headless", action="store_true", help="with --replay: no window, as fast as possible")
+    parser.add_argument("--profile", action="store_true", help="start with the frame profiler on (F3 toggles it)")
+    parser.add_argument("--trace", metavar="FILE", help="write the profiler buffer as a Chrome trace to FILE on exit")
+    parser.add_argument("--array-trash", action="store_true", help="keep trash in NumPy arrays, for very many trash")
+    parser.add_argument("--chunked-world", action="store_true", help="only simulate the part of the world near the camera")
+    parser.add_argument("--no-pack", action="store_true", help="decode the image files even if assets.pack exists")
+    parser.add_argument("--pack", metavar="FILE", default=PACK_PATH, help="asset pack to use instead of assets.pack")
+    parser.add_argument("--startup-time", action="store_true",
+                        help="print how long every startup phase took until the first frame and quit")
+    parser.add_argument("--startup-budget", type=float, metavar="MS",
+                        help="exit with status 1 if the first frame comes later than MS milliseconds")
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+class App:
+    def __init__(self, args, trace=startup_trace):
+        """
+        Start pygame, open the window and make every game object.
+
+        Importing main does none of this, so its modules can be used
+        without a window. The phases are added to the startup trace.
+
+        :param args: Options from parse_args().
+        :param trace: StartupTrace of this start.
+        """
+        self.args = args
+        self.trace = trace
+        self.trace_done = False
+        if args.headless:
+            # Read by pygame.init(), not by the import
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+        audio_engine.pre_init()  # small mixer buffer, for sound effects that follow the game closely
+        pygame.init()
+        trace.mark("pygame.init")
+
+        screen_info = pygame.display.Info()
+        os_screen_width = screen_info.current_w
+        os_screen_height = screen_info.current_h
+        os.environ['SDL_VIDEO_WINDOW_POS'] = f"{(os_screen_width-SCREEN_WIDTH)//2},{(os_screen_height-SCREEN_HEIGHT)//2}"
+
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("Ocean Cleanup Game")
+        trace.mark("window")
+
+        # Images baked by atlas.py are mapped from one file instead of decoded and scaled
+        if not args.no_pack:
+            assets.use_pack(args.pack)
+
+        loader = assets.preload(CRITICAL_ASSETS)
+        while loader.is_alive():
+            pygame.event.pump()
+            loaded, total = assets.preload_progress
+            self.screen.fill(WHITE)
+            pygame.draw.rect(self.screen, BLACK, (200, 290, 400, 20), 2)
+            pygame.draw.rect(self.screen, (0, 100, 0), (202, 292, 396 * loaded // max(total, 1), 16))
+            pygame.display.flip()
+            pygame.time.wait(15)
+
+        trash_images.cache_dir = os.path.join(os.path.dirname(__file__), ".cache")
+        trace.mark("preload")
+
+        if not args.headless:
+            bgm_path = os.path.join(os.path.dirname(__file__), "resource", "bgm.mp3")
+            pygame.mixer.music.load(bgm_path)
+            pygame.mixer.music.play(-1)  # Loop
+            trace.mark("music")
+
+        # Every effect is ready before the first frame, playing one never loads anything
+        audio.start()
+        trace.mark("sounds")
+
+        # Game components
+        self.resource_path = os.path.join(os.path.dirname(__file__), "resource")
+        self.start_screen = StartScreen(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.beach_bg = Background(os.path.join(self.resource_path, "beach.png"), SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.ocean_bg = Background(os.path.join(self.resource_path, "ocean.png"), SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.timer = Tyme(3)
+        self.trash_info = TrashInfo()
+        self.achievement = Achievement()
+        self.finish_screen = FinishScreen(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.data_book = DataBook()
+        self.data_book.prepare_page()  # scales the first page of thumbnails while the player is on the start screen
+
+        self.stepper = FixedTimestep(step_rate=SIMULATION_RATE)
+
+        # The first two keep the same trash, the array version is faster with thousands of them.
+        # The chunked one spreads the trash over chunks and lets the ones far from the camera sleep.
+        # Only the one in use is imported.
+        if args.array_trash:
+            from arrayspawn import ArrayTrashSpawner
+            self.Spawner, self.backend = ArrayTrashSpawner, "arrays"
+        elif args.chunked_world:
+            from chunks import ChunkedTrashSpawner
+            self.Spawner, self.backend = ChunkedTrashSpawner, "chunks"
+        else:
+            self.Spawner, self.backend = TrashSpawner, "objects"
+
+        # Every game gets its own seed (seed, seed + 1, ...) so its trash can be spawned again exactly
+        self.replay = InputReplay(args.replay) if args.replay else None
+        if self.replay:
+            if self.replay.backend != self.backend:
                 pygame.quit()
-                exit()
-    cap.release()
-
-def run_game():
-    global state, character, trash_spawner, total_score, previous_state, skip_video
-    running = True
-    clock = pygame.time.Clock()
-
-    screen_offset_x = 0
-    screen_offset_y = 0
-
-    # speed and velocity settings
-    SCREEN_SPEED_X = 5  # Horizontal display movement speed
-    SCREEN_SPEED_Y = 5  # Vertical display movement speed
-    VELOCITY_A = 5      # Base velocity
-    VELOCITY_B = 5      # Axial snap velocity (equal to base velocity)
-    AXIS_TOLERANCE = 2  # Tolerance for axis alignment checks
-
-    # Adjust overall game speed
-    BASE_FPS = 60  # Keep FPS constant to ensure smoothness
-
-    # Initialize spawn timer
-    spawn_timer = pygame.time.get_ticks()
-    SPAWN_DELAY = 1000  # Spawn new trash every 1 second
-
-    while running:
-        current_time = pygame.time.get_ticks()
-        
-        dt = clock.tick(BASE_FPS) / 1000.0
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN and event.key == pygame.K_b:
-                previous_state = state 
-                state = STATE_DATA_BOOK
-
-        if state == STATE_START:
-            screen.fill(WHITE)
-            start_screen.draw(screen)
-            if start_screen.start_button_clicked():
-                if not skip_video:
-                    play_video(os.path.join(resource_path, "intro.mp4"))
-                state = STATE_DAY1
-                timer.reset()
-                total_score = 0  # Reset total score at the start of the game
-            elif start_screen.achievement_button_clicked():
-                achievement.show(screen)
-            elif start_screen.help_button_clicked(): 
-                # description screen
-                screen.fill(WHITE)
-                font = pygame.font.Font(pygame.font.match_font('Tahoma'), 24)
-                text = font.render("Clean the ocean", True, (0, 0, 0))
-                screen.blit(text, (screen.get_width() // 2 - text.get_width() // 2, screen.get_height() // 2))
-                pygame.display.flip()
-                pygame.time.wait(3000)  # 3 seconds
-                state = STATE_START
-            elif start_screen.skip_video_button_clicked():
-                skip_video = not skip_video
-
-        elif state in [STATE_DAY1, STATE_DAY2]:
-            screen.fill(WHITE)
-            bg = beach_bg if state == STATE_DAY1 else ocean_bg
-            keys = pygame.key.get_pressed()
-
-            screen_is_moving = False
-            screen_movement = [0, 0]  # [dx, dy] for display screen
-
-            if keys[pygame.K_LEFT] and screen_offset_x > 0:
-                screen_movement[0] = -SCREEN_SPEED_X
-                screen_is_moving = True
-            elif keys[pygame.K_RIGHT] and screen_offset_x < bg.image_width - SCREEN_WIDTH:
-                screen_movement[0] = SCREEN_SPEED_X
-                screen_is_moving = True
-
-            if keys[pygame.K_UP] and screen_offset_y > 0:
-                screen_movement[1] = -SCREEN_SPEED_Y
-                screen_is_moving = True
-            elif keys[pygame.K_DOWN] and screen_offset_y < bg.image_height - SCREEN_HEIGHT:
-                screen_movement[1] = SCREEN_SPEED_Y
-                screen_is_moving = True
-
-            if screen_is_moving:
-                char_pos = character.get_center()
-                screen_center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-                on_y_axis, on_x_axis = character.check_axis_alignment(char_pos, screen_center)
-
-                if not on_y_axis:  
-                    screen_movement[0] = 0
-                if not on_x_axis:  
-                    screen_movement[1] = 0
-
-                screen_offset_x += screen_movement[0]
-                screen_offset_y += screen_movement[1]
-
-            screen_bounds = bg.get_screen_bounds(screen_offset_x, screen_offset_y)
-
-            if screen_is_moving:
-                screen_center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
-                dx = dy = 0
-                if keys[pygame.K_LEFT]: dx = -1
-                if keys[pygame.K_RIGHT]: dx = 1
-                if keys[pygame.K_UP]: dy = -1
-                if keys[pygame.K_DOWN]: dy = 1
-                
-                character.move(dx, dy, SCREEN_WIDTH, SCREEN_HEIGHT, 
-                             is_display_moving=True,
-                             screen_center=screen_center,
-                             screen_bounds=screen_bounds)
+                sys.exit(f"{args.replay} was recorded with the {self.replay.backend} trash backend, "
+                         f"replay it with {BACKEND_OPTIONS[self.replay.backend]}")
+            self.seed = self.replay.seed
+        elif args.seed is not None:
+            self.seed = args.seed
+        else:
+            self.seed = random.randrange(2 ** 32)
+        self.games_started = 0
+        self.recorder = InputRecorder(args.record, self.seed, SIMULATION_RATE, self.backend) if args.record else None
+
+        self.new_game(random.Random(self.seed))
+        self.state = STATE_START
+        self.previous_state = None
+        self.total_score = 0
+        self.skip_video = False
+        self.help_left_ms = 0
+
+        self.renderer = DirtyRectRenderer(enabled=USE_DIRTY_RECTS)
+
+        # Input handlers, run once per frame for the current state
+        for handled_state in [STATE_START, STATE_DAY1, STATE_DAY2]:
+            inputs.subscribe(handled_state, self.open_data_book)
+        inputs.subscribe(STATE_DATA_BOOK, self.close_data_book)
+        inputs.subscribe(STATE_ACHIEVEMENTS, self.close_achievements)
+        inputs.subscribe(None, self.profiler_keys)
+        profiler.enabled = args.profile or bool(args.trace)
+        trace.mark("game objects")
+
+    def new_game(self, rng=None):
+        """Make a new character, trash spawner and gameplay for day 1."""
+        self.character = Character(100, 100, os.path.join(self.resource_path, "character1.png"))
+        self.trash_spawner = self.Spawner(*self.beach_bg.get_image_size(), data_book=self.data_book,
+                                          clock=self.stepper.ticks, rng=rng)  # background size, data_book instance
+        self.gameplay = Gameplay(self.character, self.trash_spawner, self.trash_info, self.timer,
+                                 *self.beach_bg.get_image_size(), SCREEN_WIDTH, SCREEN_HEIGHT)
+
+    def open_data_book(self, frame):
+        if frame.key_pressed(pygame.K_b):
+            self.previous_state = self.state
+            self.state = STATE_DATA_BOOK
+
+    def close_data_book(self, frame):
+        if self.data_book.back_button_clicked(frame):
+            self.state = self.previous_state
+
+    def close_achievements(self, frame):
+        if self.achievement.handle_input(frame):
+            self.state = STATE_START
+
+    def profiler_keys(self, frame):
+        # F3 shows or hides the profiler, F4 saves what it recorded as a Chrome trace
+        if frame.key_pressed(pygame.K_F3):
+            profiler.toggle()
+            self.renderer.invalidate()  # draw or erase the overlay everywhere
+        if frame.key_pressed(pygame.K_F4):
+            profiler.export_chrome_trace(time.strftime("trace-%Y%m%d-%H%M%S.json"))
+
+    def play_video(self, video_path):
+        if self.args.headless:
+            return  # nothing to show, and the frame after a video is timed from its end
+        from video import VideoPlayer  # OpenCV is slow to import and only needed here
+        player = VideoPlayer(video_path, (SCREEN_WIDTH, SCREEN_HEIGHT))  # limit video size to screen size
+        if not player.play(self.screen):
+            if self.recorder:
+                self.recorder.close()
+            pygame.quit()
+            sys.exit()
+
+    def print_stats(self):
+        """Print what the renderer and the other parts counted this session, so their optimisations can be measured."""
+        renderer = self.renderer
+        frames = renderer.full_flips + renderer.partial_updates
+        if frames:
+            print(f"Renderer: {renderer.full_flips} full flips, {renderer.partial_updates} partial updates, "
+                  f"{renderer.pixels_pushed / frames / 1000:.0f}k pixels pushed per frame "
+                  f"({renderer.pixels_pushed / frames / (SCREEN_WIDTH * SCREEN_HEIGHT):.0%} of the screen)")
+        text = text_cache.stats()
+        if text["hits"] + text["misses"]:
+            print(f"Text cache: {text['hits'] / (text['hits'] + text['misses']):.1%} hits "
+                  f"({text['hits']} hits, {text['misses']} renders), {text['entries']} surfaces, "
+                  f"{text['bytes'] / 1e6:.1f} MB")
+        latency = inputs.latency_stats()
+        if latency["frames"]:
+            print(f"Input: handled within {latency['average_ms']:.1f} ms on average, {latency['max_ms']:.1f} ms at most "
+                  f"(last {latency['frames']} frames with input)")
+        if audio.played:
+            stats = audio.report()
+            print(f"Sounds: {stats['played']} played, {stats['stolen']} stolen, {stats['dropped']} dropped, "
+                  f"started within {stats['start_p50']} ms p50, {stats['start_p95']} ms p95; "
+                  f"estimated output latency {stats['output_p50']} ms p50, {stats['output_p95']} ms p95 "
+                  f"(start + {stats['buffer_ms']} ms mixer buffer, not measured at the speaker)")
+
+    def first_frame_done(self):
+        """
+        End the startup trace, print it for --startup-time and check --startup-budget.
+
+        :raises SystemExit: The first frame came later than the budget allows.
+        """
+        self.trace_done = True
+        self.trace.mark("first frame")
+        source = 'pack' if assets.pack else 'image files'
+        over_budget = self.trace.over_budget(self.args.startup_budget)
+        if self.args.startup_time or over_budget:
+            print(f"Startup phases ({source}):\n{self.trace.report()}")
+        if self.args.startup_time:
+            loads = assets.report()
+            if loads:
+                print("Slowest asset loads:")
+                for name, ms in loads[:ASSET_REPORT_LINES]:
+                    print(f"  {name:20} {ms:8.1f} ms")
+            print(f"First frame after {self.trace.elapsed_ms():.1f} ms ({source})")
+        if over_budget:
+            self.achievement.close()
+            pygame.quit()
+            sys.exit(f"Startup took {self.trace.elapsed_ms():.1f} ms, "
+                     f"over the budget of {self.args.startup_budget:g} ms")
+
+    def run(self):
+        running = True
+        clock = pygame.time.Clock()
+
+        # Frame rate of the renderer, the simulation always runs at SIMULATION_RATE
+        BASE_FPS = 60
+
+        drawn_state = None
+        sounded_state = None
+        drawn_offset = None
+        showing_info = False
+        replay_started = time.perf_counter()
+
+        while running:
+            if self.replay:
+                # The recorded frame times drive the simulation, the clock only paces a watched replay
+                recorded = self.replay.next_frame()
+                if recorded is None:
+                    break
+                if not self.args.headless:
+                    clock.tick(BASE_FPS)
+                    pygame.event.pump()
+                profiler.begin_frame()
+                frame, frame_ms = inputs.feed(recorded[0]), recorded[1]
             else:
-                dx = dy = 0
-                if keys[pygame.K_LEFT]: dx = -1
-                if keys[pygame.K_RIGHT]: dx = 1
-                if keys[pygame.K_UP]: dy = -1
-                if keys[pygame.K_DOWN]: dy = 1
-                character.move(dx, dy, SCREEN_WIDTH, SCREEN_HEIGHT)
-
-            bg.draw(screen, screen_offset_x, screen_offset_y)
-            character.draw(screen)
-            trash_spawner.draw(screen, screen_offset_x, screen_offset_y)
-            trash_spawner.update_screen_offset(screen_offset_x, screen_offset_y)
-
-            if current_time - spawn_timer >= SPAWN_DELAY:
-                trash_spawner.spawn_trash(count=1)
-                spawn_timer = current_time
-
-            trash_spawner.draw(screen, screen_offset_x, screen_offset_y, beach=(state == STATE_DAY1))
-
-            trash_spawner.check_collision(character, trash_info)
-            total_score = trash_spawner.get_total_score()  # Cập nhật điểm tổng
-
-            if trash_spawner.display_info:
-                display_trash_info(screen, 245, 75, trash_spawner.current_trash_id) 
-                if hide_trash_info():
-                    trash_spawner.display_info = False 
-                else:
-                    keys = pygame.key.get_pressed()
-                    if keys[pygame.K_SPACE]:
-                        trash_spawner.display_info = False 
+                frame_ms = clock.tick(BASE_FPS)
+                profiler.begin_frame()  # the time spent waiting for the next frame is not counted
+                # The only place the event queue is read, everything else uses this frame
+                with profiler.scope("input"):
+                    frame = inputs.pump()
+            if self.recorder:
+                self.recorder.record(frame, frame_ms)
+            dt = frame_ms / 1000.0
+
+            if frame.quit:
+                running = False
+            with profiler.scope("input"):
+                inputs.dispatch(self.state)
+
+            # A new state repaints everything, and menus change all over the screen (hover effects)
+            if self.state != drawn_state or self.state not in [STATE_DAY1, STATE_DAY2]:
+                self.renderer.invalidate()
+                drawn_state = self.state
+
+            if self.state == STATE_START:
+                with profiler.scope("menu"):
+                    self.screen.fill(WHITE)
+                    self.start_screen.draw(self.screen)
+                if self.start_screen.start_button_clicked(frame):
+                    if not self.skip_video:
+                        self.play_video(os.path.join(self.resource_path, "intro.mp4"))
+                        clock.tick()  # the video is not a frame, the next one is timed from here
+                    self.state = STATE_DAY1
+                    self.timer.reset()
+                    self.stepper.reset()
+                    self.trash_spawner.reseed(self.seed + self.games_started)
+                    print(f"Game {self.games_started + 1} seed {self.seed + self.games_started}")
+                    self.games_started += 1
+                    self.total_score = 0  # Reset total score at the start of the game
+                elif self.start_screen.achievement_button_clicked(frame):
+                    self.state = STATE_ACHIEVEMENTS
+                elif self.start_screen.help_button_clicked(frame): 
+                    self.state = STATE_HELP
+                    self.help_left_ms = HELP_MS
+                elif self.start_screen.skip_video_button_clicked(frame):
+                    self.skip_video = not self.skip_video
+
+            elif self.state in [STATE_DAY1, STATE_DAY2]:
+                bg = self.beach_bg if self.state == STATE_DAY1 else self.ocean_bg
+                other_bg = self.ocean_bg if self.state == STATE_DAY1 else self.beach_bg
+                if other_bg.tiles:
+                    other_bg.clear_tiles()  # the other day's tiles are not needed until it comes
+                keys = frame.keys
+
+                self.gameplay.world_width, self.gameplay.world_height = bg.get_image_size()
+
+                # Simulate in fixed steps, however long this frame took, so speed never depends on FPS
+                with profiler.scope("update"):
+                    for _ in self.stepper.steps(dt):
+                        self.gameplay.step(keys, self.stepper.step)
+                        if self.timer.time_up():
+                            break
+
+                # Draw between the last two simulation steps
+                alpha = self.stepper.alpha
+                draw_x, draw_y = self.gameplay.get_draw_offset(alpha)
+                if (draw_x, draw_y) != drawn_offset:
+                    self.renderer.invalidate()  # the whole background scrolled
+                    drawn_offset = (draw_x, draw_y)
+
+                with profiler.scope("background"):
+                    self.screen.fill(WHITE)
+                    bg.draw(self.screen, draw_x, draw_y)
+                with profiler.scope("sprites"):
+                    self.renderer.mark("character", self.character.draw(self.screen, alpha))
+                    self.trash_spawner.draw(self.screen, draw_x, draw_y, beach=(self.state == STATE_DAY1))
+
+                self.total_score = self.trash_spawner.get_total_score()  # Cập nhật điểm tổng
+                self.trash_spawner.record_changes = self.renderer.enabled
+                for rect in self.trash_spawner.pop_changed_rects():
+                    self.renderer.mark("trash", rect)
+
+                if self.trash_spawner.display_info != showing_info:
+                    self.renderer.invalidate()  # info box opened or closed
+                    showing_info = self.trash_spawner.display_info
+
+                if self.trash_spawner.display_info:
+                    with profiler.scope("info box"):
+                        display_trash_info(self.screen, 245, 75, self.trash_spawner.current_trash_id)
+                    if hide_trash_info(frame):
+                        self.trash_spawner.display_info = False 
+
+                with profiler.scope("hud"):
+                    if self.state != STATE_DATA_BOOK:  
+                        self.renderer.mark("hud", self.timer.draw(self.screen))
+
+                    day_font = get_font('Tahoma', 30)
+                    day_text = render_text(f"Ngày {1 if self.state == STATE_DAY1 else 2}", day_font, (255, 0, 0))
+                    self.screen.blit(day_text, (10, 10))
+
+                    # Hiển thị điểm tổng
+                    score_font = get_font('Tahoma', 24)
+                    score_text = render_text(f"Điểm: {self.total_score}", score_font, (0, 0, 255))
+                    self.renderer.mark("hud", self.screen.blit(score_text, (10, 50)))
+
+                    data_book_button = pygame.Rect(10, SCREEN_HEIGHT - 60, 50, 50)
+                    pygame.draw.rect(self.screen, (0, 100, 0), data_book_button, border_radius=15)
+                    pygame.draw.rect(self.screen, (255, 255, 255), data_book_button, 3, border_radius=15)
+                    button_font = get_font('Tahoma', 30)
+                    button_text = render_text("B", button_font, (255, 255, 255))
+                    self.screen.blit(button_text, (data_book_button.centerx - button_text.get_width() // 2,
+                                                   data_book_button.centery - button_text.get_height() // 2))
+
+                if frame.clicked(data_book_button):
+                    self.previous_state = self.state  
+                    self.state = STATE_DATA_BOOK
+
+                if self.timer.time_up():
+                    if self.state == STATE_DAY1:
+                        self.state = STATE_DAY2
+                        # Reset character for day 2
+                        self.character = Character(100, 100, os.path.join(self.resource_path, "character2.png"))
+                        self.gameplay.character = self.character
                     else:
-                        SCREEN_SPEED_X = 0
-                        SCREEN_SPEED_Y = 0
-                        VELOCITY_A = 0
-                        VELOCITY_B = 0
-            else:
-                SCREEN_SPEED_X = 5
-                SCREEN_SPEED_Y = 5
-                VELOCITY_A = 5
-                VELOCITY_B = 5
-
-            if state != STATE_DATA_BOOK:  
-                timer.update(screen, trash_spawner.display_info)
-
-            day_font = pygame.font.Font(pygame.font.match_font('Tahoma'), 30)
-            day_text = day_font.render(f"Ngày {1 if state == STATE_DAY1 else 2}", True, (255, 0, 0))
-            screen.blit(day_text, (10, 10))
-
-            # Hiển thị điểm tổng
-            score_font = pygame.font.Font(pygame.font.match_font('Tahoma'), 24)
-            score_text = score_font.render(f"Điểm: {total_score}", True, (0, 0, 255))
-            screen.blit(score_text, (10, 50))
-
-            data_book_button = pygame.Rect(10, SCREEN_HEIGHT - 60, 50, 50)
-            pygame.draw.rect(screen, (0, 100, 0), data_book_button, border_radius=15)
-            pygame.draw.rect(screen, (255, 255, 255), data_book_button, 3, border_radius=15)
-            button_font = pygame.font.Font(pygame.font.match_font('Tahoma'), 30)
-            button_text = button_font.render("B", True, (255, 255, 255))
-            screen.blit(button_text, (data_book_button.centerx - button_text.get_width() // 2,
-                                      data_book_button.centery - button_text.get_height() // 2))
-
-            if data_book_button.collidepoint(pygame.mouse.get_pos()) and pygame.mouse.get_pressed()[0]:
-                previous_state = state  
-                state = STATE_DATA_BOOK
-
-            if keys[pygame.K_b]:
-                previous_state = state  
-                state = STATE_DATA_BOOK
-
-            if timer.time_up():
-                if state == STATE_DAY1:
-                    state = STATE_DAY2
-                    character = Character(100, 100, os.path.join(resource_path, "character2.png"))  # Reset character for day 2
-                else:
-                    if not skip_video:
-                        play_video(os.path.join(resource_path, "aftercredit.mp4"))
-                    state = STATE_END
-                timer.reset()
-
-        elif state == STATE_END:
-            finish_screen.draw(screen, total_score)
-            achievement.save_achievement(total_score)  # Save total score to achievements
-            
-            if finish_screen.check_play_again():
-                state = STATE_START
-                screen_offset_x = 0
-                screen_offset_y = 0
-                # Reset values
-                trash_spawner = TrashSpawner(*beach_bg.get_image_size(), data_book=data_book)
-                character = Character(100, 100, os.path.join(resource_path, "character1.png"))  # Reset character for day 1
-
-            pygame.display.flip()
-
-        elif state == STATE_DATA_BOOK:
-            screen.fill(WHITE)
-            data_book.draw(screen)
-            if data_book.back_button_clicked():
-                state = previous_state 
-
-        pygame.display.flip()
+                        if not self.skip_video:
+                            self.play_video(os.path.join(self.resource_path, "aftercredit.mp4"))
+                            clock.tick()
+                        self.state = STATE_END
+                    self.timer.reset()
+                    self.stepper.reset()  # time left after the last step of a day does not carry over
+
+            elif self.state == STATE_END:
+                with profiler.scope("menu"):
+                    self.finish_screen.draw(self.screen, self.total_score)
+                with profiler.scope("save"):
+                    self.achievement.save_achievement(self.total_score)  # Save total score to achievements
+                
+                if self.finish_screen.check_play_again(frame):
+                    self.state = STATE_START
+                    # Reset values
+                    self.new_game(random.Random(self.seed + self.games_started))
+
+            elif self.state == STATE_DATA_BOOK:
+                with profiler.scope("menu"):
+                    self.screen.fill(WHITE)
+                    self.data_book.draw(self.screen)
+
+            elif self.state == STATE_ACHIEVEMENTS:
+                with profiler.scope("menu"):
+                    self.achievement.show(self.screen)
+
+            elif self.state == STATE_HELP:
+                # description screen, drawn every frame like the other menus instead of blocking the loop
+                with profiler.scope("menu"):
+                    self.screen.fill(WHITE)
+                    font = get_font('Tahoma', 24)
+                    text = render_text("Clean the ocean", font, (0, 0, 0))
+                    self.screen.blit(text, (self.screen.get_width() // 2 - text.get_width() // 2,
+                                            self.screen.get_height() // 2))
+                self.help_left_ms -= frame_ms
+                if self.help_left_ms <= 0 or frame.key_pressed(pygame.K_SPACE):
+                    self.state = STATE_START
+
+            if self.state != sounded_state:
+                effect = STATE_SOUNDS.get((sounded_state, self.state))
+                if effect:
+                    audio.play(effect)
+                sounded_state = self.state
+
+            with profiler.scope("profiler"):
+                self.renderer.mark("profiler", profiler.draw(self.screen))
+            with profiler.scope("present"):
+                self.renderer.present()  # the only flip of the frame
+            inputs.end_frame()
+            profiler.end_frame()
+            if not self.trace_done:
+                self.first_frame_done()
+                if self.args.startup_time:
+                    break
+
+        self.achievement.close()  # scores still queued for the disk
+        self.print_stats()
+        if self.recorder:
+            self.recorder.close()
+        if self.args.trace:
+            profiler.export_chrome_trace(self.args.trace)
+        if self.replay:
+            print(f"Replayed {self.replay.frames} frames in {time.perf_counter() - replay_started:.2f}s: "
+                  f"state {self.state}, score {self.total_score}, {self.stepper.steps_run} simulation steps")
+        pygame.quit()
+
+
+def main(argv=None):
+    App(parse_args(argv)).run()
 
-    pygame.quit()
 
 if __name__ == "__main__":
-    run_game()
+    main()
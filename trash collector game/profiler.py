@@ -0,0 +1,215 @@
+import json
+import time
+import pygame
+from fonts import get_font, render_text
+
+FRAME_BUDGET = 1000 / 60  # milliseconds of one frame at 60 FPS
+
+
+class _NullScope:
+    """Scope used while the profiler is off, entering and leaving it does nothing."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, self.start, time.perf_counter() - self.start)
+        return False
+
+
+class FrameProfiler:
+    def __init__(self, frames=300, max_events=16384, enabled=False):
+        """
+        Initialize the frame profiler.
+
+        Timed scopes go into fixed-size ring buffers, so a long session never
+        grows memory and the newest frames are always there to look at or
+        to export. While disabled, scope() hands out a shared object that
+        does nothing.
+
+        :param frames: How many frames the overlay graph and breakdown keep.
+        :param max_events: How many timed scopes are kept for the trace export.
+        :param enabled: Start recording right away.
+        """
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        # Scope ring buffer, one slot per timed scope
+        self.max_events = max_events
+        self.event_names = [None] * max_events
+        self.event_starts = [0.0] * max_events
+        self.event_durations = [0.0] * max_events
+        self.event_count = 0  # total ever added, the slot is event_count % max_events
+        # Frame ring buffer
+        self.max_frames = frames
+        self.frame_times = [0.0] * frames  # milliseconds
+        self.frame_phases = [None] * frames  # phase name -> milliseconds
+        self.frame_count = 0
+        self.frame_start = None
+        self.phases = {}  # phases of the frame being recorded
+        self.overlay_lines = []  # breakdown text, refreshed a few times per second
+        self.overlay_rect = None
+
+    def scope(self, name):
+        """
+        Time a block of code: with profiler.scope("collision"): ...
+
+        :param name: Phase name shown in the overlay and the trace.
+        """
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _Scope(self, name)
+
+    def add(self, name, start, duration):
+        """
+        Store one timed scope.
+
+        :param start: time.perf_counter() when it began.
+        :param duration: Seconds it took.
+        """
+        slot = self.event_count % self.max_events
+        self.event_names[slot] = name
+        self.event_starts[slot] = start
+        self.event_durations[slot] = duration
+        self.event_count += 1
+        self.phases[name] = self.phases.get(name, 0.0) + duration * 1000
+
+    def begin_frame(self):
+        """Start timing a frame. Call once per frame before its work."""
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+            self.phases = {}
+
+    def end_frame(self):
+        """Finish the frame started by begin_frame()."""
+        if not self.enabled or self.frame_start is None:
+            return
+        duration = time.perf_counter() - self.frame_start
+        self.add("frame", self.frame_start, duration)
+        slot = self.frame_count % self.max_frames
+        self.frame_times[slot] = duration * 1000
+        self.frame_phases[slot] = self.phases
+        self.frame_count += 1
+        self.frame_start = None
+
+    def toggle(self):
+        """Turn recording and the overlay on or off."""
+        self.enabled = not self.enabled
+        self.frame_start = None
+
+    def recent_frames(self):
+        """
+        Return the recorded frames, oldest first.
+
+        :return: List of (frame milliseconds, phase name -> milliseconds).
+        """
+        count = min(self.frame_count, self.max_frames)
+        first = self.frame_count - count
+        return [(self.frame_times[i % self.max_frames], self.frame_phases[i % self.max_frames])
+                for i in range(first, self.frame_count)]
+
+    def breakdown(self, frames=60):
+        """
+        Average and worst milliseconds per phase over the last frames.
+
+        :return: List of (name, average, worst), slowest first.
+        """
+        recent = self.recent_frames()[-frames:]
+        if not recent:
+            return []
+        totals = {}
+        worst = {}
+        for frame_time, phases in recent:
+            for name, ms in list(phases.items()) + [("frame", frame_time)]:
+                totals[name] = totals.get(name, 0.0) + ms
+                worst[name] = max(worst.get(name, 0.0), ms)
+        rows = [(name, total / len(recent), worst[name]) for name, total in totals.items()]
+        return sorted(rows, key=lambda row: row[1], reverse=True)
+
+    def draw(self, screen, x=None, y=70, width=240, graph_height=60):
+        """
+        Draw the frame time graph and the phase breakdown.
+
+        :param screen: The pygame display surface.
+        :return: The area covered, or None when disabled.
+        """
+        if not self.enabled:
+            return None
+        font = get_font(None, 18)
+        if self.frame_count % 15 == 0 or not self.overlay_lines:
+            # Refresh the numbers a few times per second, so the text cache is not flooded
+            self.overlay_lines = [(name, f"{average:.2f}", f"{worst:.2f} ms")
+                                  for name, average, worst in self.breakdown()[:10]]
+        line_height = font.get_linesize()
+        height = graph_height + 10 + line_height * (len(self.overlay_lines) + 1)
+        if x is None:
+            x = screen.get_width() - width - 10
+
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+
+        # One bar per frame, green under the 60 FPS budget, red over it
+        recent = self.recent_frames()[-width:]
+        scale = graph_height / (FRAME_BUDGET * 2)
+        for i, (frame_time, _) in enumerate(recent):
+            bar = min(graph_height, int(frame_time * scale) + 1)
+            color = (80, 220, 80) if frame_time <= FRAME_BUDGET else (230, 60, 60)
+            pygame.draw.line(panel, color, (width - len(recent) + i, graph_height),
+                             (width - len(recent) + i, graph_height - bar))
+        budget_y = graph_height - int(FRAME_BUDGET * scale)
+        pygame.draw.line(panel, (255, 255, 0), (0, budget_y), (width, budget_y))
+
+        # Columns: phase, average, worst
+        text_y = graph_height + 5
+        for line in [("phase", "avg", "worst")] + self.overlay_lines:
+            for column, text in zip((5, 110, 165), line):
+                panel.blit(render_text(text, font, (255, 255, 255)), (column, text_y))
+            text_y += line_height
+
+        self.overlay_rect = screen.blit(panel, (x, y))
+        return self.overlay_rect
+
+    def export_chrome_trace(self, path):
+        """
+        Write the scope ring buffer as Chrome trace events, for chrome://tracing or Perfetto.
+
+        :param path: JSON file to write.
+        :return: Number of events written.
+        """
+        count = min(self.event_count, self.max_events)
+        first = self.event_count - count
+        events = []
+        for i in range(first, self.event_count):
+            slot = i % self.max_events
+            events.append({
+                "name": self.event_names[slot],
+                "cat": "game",
+                "ph": "X",  # complete event: start and duration
+                "ts": round((self.event_starts[slot] - self.origin) * 1e6, 1),
+                "dur": round(self.event_durations[slot] * 1e6, 1),
+                "pid": 1,
+                "tid": 1,
+            })
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        print(f"Wrote {len(events)} profiler events to {path}")
+        return len(events)
+
+
+profiler = FrameProfiler()
@@ -0,0 +1,60 @@
+import pygame
+
+
+class DirtyRectRenderer:
+    def __init__(self, enabled=True):
+        """
+        Initialize the renderer that pushes finished frames to the window.
+
+        The game still draws the whole frame into the screen surface, but when
+        the camera is still only the rectangles marked as changed are sent to
+        the window with pygame.display.update(rects). Anything else (camera
+        moving, state change, overlay opened) falls back to a full flip.
+
+        :param enabled: False to always flip the whole screen.
+        """
+        self.enabled = enabled
+        self.layers = {}  # layer name -> rects changed this frame
+        self.last_layers = {}  # rects changed last frame, pushed again so old positions get cleared
+        self.full_redraw = True
+        self.full_flips = 0
+        self.partial_updates = 0
+        self.pixels_pushed = 0
+
+    def mark(self, layer, rect):
+        """
+        Mark an area of the screen as changed this frame.
+
+        :param layer: Name of the layer, e.g. "character" or "hud".
+        :param rect: A pygame Rect or (x, y, width, height), e.g. the return value of blit().
+        """
+        if rect:
+            self.layers.setdefault(layer, []).append(pygame.Rect(rect))
+
+    def invalidate(self):
+        """
+        Make the next present() flip the whole screen.
+        """
+        self.full_redraw = True
+
+    def present(self):
+        """
+        Show the frame. Call this exactly once per frame.
+        """
+        if not self.enabled or self.full_redraw:
+            pygame.display.flip()
+            self.full_flips += 1
+            surface = pygame.display.get_surface()
+            if surface is not None:
+                self.pixels_pushed += surface.get_width() * surface.get_height()
+        else:
+            rects = [rect for rects in self.layers.values() for rect in rects]
+            rects += [rect for rects in self.last_layers.values() for rect in rects]
+            if rects:
+                pygame.display.update(rects)
+                self.pixels_pushed += sum(rect.width * rect.height for rect in rects)
+            self.partial_updates += 1
+
+        self.last_layers = self.layers
+        self.layers = {}
+        self.full_redraw = False
@@ -0,0 +1,251 @@
+import struct
+import time
+import pygame
+from inputs import InputFrame, PressedKeys
+
+MAGIC = b"TCRP"
+VERSION = 4  # bump when the same input plays out differently, so old recordings are refused
+HEADER = struct.Struct("<4sBQHB")  # magic, version, seed, simulation step rate, trash backend
+
+# Trash backends, stored by position. They keep trash differently, so a replay must use the recorded one.
+BACKENDS = ["objects", "arrays", "chunks"]
+
+# Keys the game reads as held every tick, one bit each
+HELD_KEYS = [pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN, pygame.K_SPACE, pygame.K_b]
+
+# Bits of the flag byte that starts every record, a set bit means the field follows
+FRAME_MS = 0x01  # frame time changed
+HELD = 0x02  # held keys changed
+KEY_EVENTS = 0x04  # keys went down or up
+MOUSE_MOVED = 0x08  # mouse position changed, stored as a difference
+CLICKS = 0x10  # mouse buttons went down
+QUIT = 0x20  # window was closed
+MOUSE_BUTTONS = 0x40  # held mouse buttons changed
+REPEAT = 0x80  # alone: a run of frames identical to the previous one, count follows
+
+
+def write_varint(out, value):
+    """Append an unsigned integer to a bytearray, 7 bits per byte."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    """
+    Read an unsigned integer written by write_varint.
+
+    :return: Tuple (value, position after it).
+    """
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def zigzag(value):
+    """Map signed to unsigned so small negative numbers stay small (-1 -> 1, 1 -> 2)."""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value):
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def held_mask(keys):
+    """Pack the HELD_KEYS of a pygame key state into one byte."""
+    mask = 0
+    for bit, key in enumerate(HELD_KEYS):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+
+class InputRecorder:
+    def __init__(self, path, seed, step_rate=60, backend="objects"):
+        """
+        Write the input of every frame to a compact binary log.
+
+        Each frame is one record that only holds what changed since the
+        previous frame, and a run of unchanged frames is a single record, so
+        a player standing still costs almost nothing.
+
+        :param path: File to write.
+        :param seed: Seed of the game, stored so the replay spawns the same trash.
+        :param step_rate: Simulation steps per second of the game.
+        :param backend: Trash backend of the game, one of BACKENDS.
+        """
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, step_rate, BACKENDS.index(backend)))
+        self.buffer = bytearray()
+        self.frames = 0
+        self.repeats = 0  # unchanged frames not written yet
+        self.frame_ms = 0
+        self.held = 0
+        self.mouse_pos = (0, 0)
+        self.mouse_buttons = 0
+
+    def record(self, frame, frame_ms):
+        """
+        Add one frame.
+
+        :param frame: The InputFrame the game used this frame.
+        :param frame_ms: Milliseconds since the previous frame, as used by the simulation.
+        """
+        self.frames += 1
+        held = held_mask(frame.keys)
+        mouse_buttons = sum(1 << i for i, down in enumerate(frame.mouse_buttons) if down)
+        key_events = [(event.key, event.type == pygame.KEYDOWN) for event in frame.events
+                      if event.type in (pygame.KEYDOWN, pygame.KEYUP)]
+
+        flags = 0
+        if frame_ms != self.frame_ms:
+            flags |= FRAME_MS
+        if held != self.held:
+            flags |= HELD
+        if key_events:
+            flags |= KEY_EVENTS
+        if frame.mouse_pos != self.mouse_pos:
+            flags |= MOUSE_MOVED
+        if frame.clicks:
+            flags |= CLICKS
+        if frame.quit:
+            flags |= QUIT
+        if mouse_buttons != self.mouse_buttons:
+            flags |= MOUSE_BUTTONS
+
+        if not flags:
+            self.repeats += 1
+            return
+        self._flush_repeats()
+
+        out = self.buffer
+        out.append(flags)
+        if flags & FRAME_MS:
+            write_varint(out, frame_ms)
+        if flags & HELD:
+            out.append(held)
+        if flags & KEY_EVENTS:
+            write_varint(out, len(key_events))
+            for key, down in key_events:
+                write_varint(out, key * 2 + down)
+        if flags & MOUSE_MOVED:
+            write_varint(out, zigzag(frame.mouse_pos[0] - self.mouse_pos[0]))
+            write_varint(out, zigzag(frame.mouse_pos[1] - self.mouse_pos[1]))
+        if flags & CLICKS:
+            write_varint(out, len(frame.clicks))
+            for button, (x, y) in frame.clicks:
+                out.append(button)
+                write_varint(out, x)
+                write_varint(out, y)
+        if flags & MOUSE_BUTTONS:
+            out.append(mouse_buttons)
+
+        self.frame_ms = frame_ms
+        self.held = held
+        self.mouse_pos = tuple(frame.mouse_pos)
+        self.mouse_buttons = mouse_buttons
+        if len(out) >= 4096:
+            self.file.write(out)
+            out.clear()
+
+    def _flush_repeats(self):
+        if self.repeats:
+            self.buffer.append(REPEAT)
+            write_varint(self.buffer, self.repeats)
+            self.repeats = 0
+
+    def close(self):
+        """Write what is left and close the file."""
+        if self.file.closed:
+            return
+        self._flush_repeats()
+        self.file.write(self.buffer)
+        self.buffer.clear()
+        size = self.file.tell()
+        self.file.close()
+        print(f"Recorded {self.frames} frames to {self.path} ({size} bytes)")
+
+
+class InputReplay:
+    def __init__(self, path):
+        """
+        Read a log written by InputRecorder.
+
+        :param path: File to read.
+        :raises ValueError: The file is not an input recording of this version.
+        """
+        with open(path, 'rb') as f:
+            self.data = f.read()
+        if len(self.data) < HEADER.size or self.data[4] != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} input recording")
+        magic, version, self.seed, self.step_rate, backend = HEADER.unpack_from(self.data)
+        if magic != MAGIC or backend >= len(BACKENDS):
+            raise ValueError(f"{path} is not a version {VERSION} input recording")
+        self.backend = BACKENDS[backend]
+        self.pos = HEADER.size
+        self.frames = 0
+        self.repeats = 0
+        self.frame_ms = 0
+        self.held = 0
+        self.mouse_pos = (0, 0)
+        self.mouse_buttons = 0
+
+    def next_frame(self):
+        """
+        Rebuild the next recorded frame.
+
+        :return: Tuple (InputFrame, frame_ms), or None when the recording is over.
+        """
+        events = []
+        if self.repeats:
+            self.repeats -= 1
+        else:
+            if self.pos >= len(self.data):
+                return None
+            data = self.data
+            flags = data[self.pos]
+            self.pos += 1
+            if flags == REPEAT:
+                count, self.pos = read_varint(data, self.pos)
+                self.repeats = count - 1
+            else:
+                if flags & FRAME_MS:
+                    self.frame_ms, self.pos = read_varint(data, self.pos)
+                if flags & HELD:
+                    self.held = data[self.pos]
+                    self.pos += 1
+                if flags & KEY_EVENTS:
+                    count, self.pos = read_varint(data, self.pos)
+                    for _ in range(count):
+                        value, self.pos = read_varint(data, self.pos)
+                        event_type = pygame.KEYDOWN if value % 2 else pygame.KEYUP
+                        events.append(pygame.event.Event(event_type, key=value // 2, mod=0))
+                if flags & MOUSE_MOVED:
+                    dx, self.pos = read_varint(data, self.pos)
+                    dy, self.pos = read_varint(data, self.pos)
+                    self.mouse_pos = (self.mouse_pos[0] + unzigzag(dx), self.mouse_pos[1] + unzigzag(dy))
+                if flags & CLICKS:
+                    count, self.pos = read_varint(data, self.pos)
+                    for _ in range(count):
+                        button = data[self.pos]
+                        x, self.pos = read_varint(data, self.pos + 1)
+                        y, self.pos = read_varint(data, self.pos)
+                        events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=button, pos=(x, y)))
+                if flags & MOUSE_BUTTONS:
+                    self.mouse_buttons = data[self.pos]
+                    self.pos += 1
+                if flags & QUIT:
+                    events.append(pygame.event.Event(pygame.QUIT))
+
+        self.frames += 1
+        keys = PressedKeys(key for bit, key in enumerate(HELD_KEYS) if self.held & (1 << bit))
+        mouse_buttons = tuple(bool(self.mouse_buttons & (1 << i)) for i in range(3))
+        frame = InputFrame(events, keys, self.mouse_pos, mouse_buttons, time.perf_counter())
+        return frame, self.frame_ms
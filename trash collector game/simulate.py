@@ -0,0 +1,256 @@
+import argparse
+import csv
+import itertools
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# No window and no sound card needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from char import Character
+from gameplay import Gameplay
+from inputs import PressedKeys
+from spawn import TrashSpawner
+from arrayspawn import ArrayTrashSpawner
+from chunks import ChunkedTrashSpawner
+from timestep import FixedTimestep
+from trashinfo import TrashInfo
+from tyme import Tyme
+
+resource_path = os.path.join(os.path.dirname(__file__), "resource")
+
+# Size of the 3x scaled beach and ocean backgrounds
+WORLD_WIDTH = 5760
+WORLD_HEIGHT = 3240
+
+# Trash storage the sessions can run on
+SPAWNERS = {"objects": TrashSpawner, "arrays": ArrayTrashSpawner, "chunks": ChunkedTrashSpawner}
+
+
+class QuietTrashInfo(TrashInfo):
+    """TrashInfo that does not print a line for every collected trash."""
+    def collect_trash(self, trash_info):
+        self.collected_trash.setdefault(trash_info["id"], trash_info)
+
+
+def greedy_policy(gameplay):
+    """
+    Walk towards the nearest trash, like a player who always goes for the closest one.
+
+    :param gameplay: The running Gameplay.
+    :return: PressedKeys for this step.
+    """
+    character = gameplay.character
+    center_x, center_y = character.get_center()
+    world_x = center_x + gameplay.screen_offset_x
+    world_y = center_y + gameplay.screen_offset_y
+
+    nearest = None
+    nearest_distance = None
+    for x, y, width, height in gameplay.trash_spawner.trash_positions():
+        center = (x + width // 2, y + height // 2)
+        distance = abs(center[0] - world_x) + abs(center[1] - world_y)
+        if nearest is None or distance < nearest_distance:
+            nearest, nearest_distance = center, distance
+    if nearest is None:
+        return PressedKeys()
+
+    keys = []
+    target_x, target_y = nearest
+    if target_x < world_x - character.base_speed:
+        keys.append(pygame.K_LEFT)
+    elif target_x > world_x + character.base_speed:
+        keys.append(pygame.K_RIGHT)
+    if target_y < world_y - character.base_speed:
+        keys.append(pygame.K_UP)
+    elif target_y > world_y + character.base_speed:
+        keys.append(pygame.K_DOWN)
+    return PressedKeys(keys)
+
+
+def scripted_policy(script):
+    """
+    Make a policy that plays back a fixed list of moves, over and over.
+
+    :param script: List of (steps, keys) pairs, e.g. [(60, [pygame.K_RIGHT]), (30, [])].
+    :return: A policy function.
+    """
+    moves = [PressedKeys(keys) for steps, keys in script for _ in range(steps)]
+    counter = itertools.count()
+
+    def policy(gameplay):
+        return moves[next(counter) % len(moves)]
+    return policy
+
+
+def wander_script():
+    """A simple scripted route: sweep right and down, then back."""
+    return [(120, [pygame.K_RIGHT]), (60, [pygame.K_DOWN]), (120, [pygame.K_LEFT]), (60, [pygame.K_DOWN]),
+            (120, [pygame.K_RIGHT]), (60, [pygame.K_UP]), (120, [pygame.K_LEFT]), (60, [pygame.K_UP])]
+
+
+def run_session(seed=0, policy="greedy", min_trash=15, max_trash=30, spawn_delay=1000, hitbox_size=40,
+                duration_minutes=3, days=2, info_pause_steps=0, step_rate=60,
+                world_width=WORLD_WIDTH, world_height=WORLD_HEIGHT, backend="objects"):
+    """
+    Play one whole game without a display, as fast as the CPU allows.
+
+    :param seed: Seed for the random numbers, the same seed plays the same game.
+    :param policy: "greedy", "scripted" or a function taking the Gameplay and returning held keys.
+    :param min_trash: TrashSpawner.min_trash.
+    :param max_trash: TrashSpawner.max_trash.
+    :param spawn_delay: TrashSpawner.spawn_delay in milliseconds.
+    :param hitbox_size: Character.hitbox_size, how close the player must get to collect.
+    :param duration_minutes: Length of one day, like Tyme(duration_minutes).
+    :param days: Number of days in the game.
+    :param info_pause_steps: Steps the trash info box stays open after each collection.
+    :param step_rate: Simulation steps per second.
+    :param backend: A name of SPAWNERS.
+    :return: Dictionary with the parameters and the results of the session.
+    """
+    if policy == "greedy":
+        choose_keys = greedy_policy
+    elif policy == "scripted":
+        choose_keys = scripted_policy(wander_script())
+    else:
+        choose_keys = policy
+
+    stepper = FixedTimestep(step_rate=step_rate)
+    trash_info = QuietTrashInfo()
+    timer = Tyme(duration_minutes)
+    spawner_class = SPAWNERS[backend]
+    trash_spawner = spawner_class(world_width, world_height, max_trash=max_trash, clock=stepper.ticks,
+                                  rng=random.Random(seed))
+    trash_spawner.min_trash = min_trash
+    trash_spawner.spawn_delay = spawn_delay
+
+    started = time.perf_counter()
+    collected = 0
+    for day in range(1, days + 1):
+        character = Character(100, 100, os.path.join(resource_path, f"character{min(day, 2)}.png"))
+        character.hitbox_size = hitbox_size
+        if day == 1:
+            gameplay = Gameplay(character, trash_spawner, trash_info, timer, world_width, world_height)
+        else:
+            gameplay.character = character  # the camera and the trash stay, like in the game
+        timer.reset()
+
+        info_open_for = 0
+        while not timer.time_up():
+            before = trash_spawner.score
+            stepper.steps_run += 1
+            gameplay.step(choose_keys(gameplay), stepper.step)
+            if trash_spawner.score != before:
+                collected += 1
+            if trash_spawner.display_info:
+                info_open_for += 1
+                if info_open_for > info_pause_steps:
+                    trash_spawner.display_info = False  # the player pressed space
+                    info_open_for = 0
+
+    elapsed = time.perf_counter() - started
+    return {
+        "seed": seed,
+        "policy": policy if isinstance(policy, str) else getattr(policy, "__name__", "custom"),
+        "min_trash": min_trash,
+        "max_trash": max_trash,
+        "spawn_delay": spawn_delay,
+        "hitbox_size": hitbox_size,
+        "duration_minutes": duration_minutes,
+        "score": trash_spawner.get_total_score(),
+        "collected": collected,
+        "trash_left": trash_spawner.trash_count(),
+        "steps": stepper.steps_run,
+        "speedup": round(stepper.steps_run / step_rate / elapsed, 1) if elapsed else 0,
+    }
+
+
+def _run_session_kwargs(kwargs):
+    return run_session(**kwargs)
+
+
+def sweep(grid, seeds, policy="greedy", duration_minutes=3, workers=None, out_path="sweep.csv", backend="objects"):
+    """
+    Run every parameter combination with every seed on a process pool.
+
+    :param grid: Dictionary of parameter name -> list of values, e.g. {"max_trash": [30, 60]}.
+    :param seeds: Iterable of seeds, one session per seed and combination.
+    :param policy: "greedy" or "scripted".
+    :param duration_minutes: Length of one day.
+    :param workers: Number of processes, defaults to the number of cores.
+    :param out_path: CSV file written with one row per session.
+    :param backend: A name of SPAWNERS, see run_session().
+    :return: List of per-combination summaries (mean, stdev, p10, p50, p90 of the score).
+    """
+    names = sorted(grid)
+    jobs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        for seed in seeds:
+            job = dict(zip(names, values), seed=seed, policy=policy, duration_minutes=duration_minutes,
+                       backend=backend)
+            jobs.append(job)
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for row in pool.map(_run_session_kwargs, jobs, chunksize=max(1, len(jobs) // 64)):
+            rows.append(row)
+
+    with open(out_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    summaries = []
+    for values, group in itertools.groupby(sorted(rows, key=lambda r: [r[n] for n in names]),
+                                           key=lambda r: [r[n] for n in names]):
+        scores = sorted(r["score"] for r in group)
+        deciles = statistics.quantiles(scores, n=10) if len(scores) > 1 else scores * 9
+        summaries.append(dict(zip(names, values), sessions=len(scores),
+                              mean=round(statistics.mean(scores), 2),
+                              stdev=round(statistics.pstdev(scores), 2),
+                              p10=deciles[0], p50=deciles[4], p90=deciles[8]))
+    return summaries
+
+
+def _int_list(text):
+    return [int(value) for value in text.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play the game headless, once or as a parameter sweep.")
+    parser.add_argument("--seed", type=int, default=0, help="seed of a single session")
+    parser.add_argument("--sessions", type=int, default=0, help="seeds per combination, runs a sweep when > 0")
+    parser.add_argument("--policy", choices=["greedy", "scripted"], default="greedy")
+    parser.add_argument("--minutes", type=float, default=3, help="length of one day")
+    parser.add_argument("--min-trash", type=_int_list, default=[15])
+    parser.add_argument("--max-trash", type=_int_list, default=[30])
+    parser.add_argument("--spawn-delay", type=_int_list, default=[1000])
+    parser.add_argument("--hitbox-size", type=_int_list, default=[40])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--backend", choices=sorted(SPAWNERS), default="objects", help="trash storage")
+    parser.add_argument("--out", default="sweep.csv", help="CSV file of the sweep")
+    args = parser.parse_args()
+
+    if args.sessions <= 0:
+        print(run_session(seed=args.seed, policy=args.policy, min_trash=args.min_trash[0],
+                          max_trash=args.max_trash[0], spawn_delay=args.spawn_delay[0],
+                          hitbox_size=args.hitbox_size[0], duration_minutes=args.minutes, backend=args.backend))
+        return
+
+    grid = {"min_trash": args.min_trash, "max_trash": args.max_trash,
+            "spawn_delay": args.spawn_delay, "hitbox_size": args.hitbox_size}
+    started = time.perf_counter()
+    summaries = sweep(grid, range(args.sessions), policy=args.policy, duration_minutes=args.minutes,
+                      workers=args.workers, out_path=args.out, backend=args.backend)
+    for summary in summaries:
+        print(summary)
+    print(f"Wrote {args.out} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
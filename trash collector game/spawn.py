@@ -2,24 +2,48 @@ import pygame
 import random
 import os
 from trashinfo import TrashInfo, DataBook, display_trash_info, hide_trash_info 
+from grid import SpatialHash
+from wheel import TimingWheel
+from sprites import get_sprite
+from fonts import get_font, render_text
+from audio import audio
+from catalogue import catalogue
 
 
 class Trash:
     resource_path = os.path.join(os.path.dirname(__file__), "resource")
-    trash_image = pygame.image.load(os.path.join(resource_path, "trashbag.png"))
+    trash_image_path = os.path.join(resource_path, "trashbag.png")
+    collection_radius = 40  # Increased collection radius
+
+    # No per-instance __dict__, many trash items can be alive at once
+    __slots__ = ("original_x", "original_y", "width", "height", "rect", "image",
+                 "image_offset_x", "image_offset_y", "info")
+
     def __init__(self, x, y, width=100, height=100, info=None):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.reset(x, y, width, height, info)
+
+    def reset(self, x, y, width=100, height=100, info=None):
+        """
+        Set up the trash again at a new place, so a collected or despawned
+        trash can be reused instead of making a new one.
+        """
         self.original_x = x
         self.original_y = y
         self.width = width
         self.height = height
-        self.rect = pygame.Rect(x, y, width, height)
-        image_width = int(width * 2.85)
-        image_height = int(height * 1.5)
-        self.image = pygame.transform.scale(Trash.trash_image, (image_width, image_height))
+        self.rect.update(x, y, width, height)
+        image_width, image_height = Trash.image_size(width, height)
+        # Shared with every other trash of the same size, never draw onto it
+        self.image = get_sprite(Trash.trash_image_path, (image_width, image_height))
         self.image_offset_x = (image_width - width) // 2
         self.image_offset_y = (image_height - height) // 2
-        self.info = info if info else random.choice(TrashInfo.TRASH_TYPES)
-        self.collection_radius = 40  # Increased collection radius
+        self.info = info if info else catalogue.choose(random)
+
+    @staticmethod
+    def image_size(width=100, height=100):
+        """Return the size of the trash image around a hitbox of the given size."""
+        return int(width * 2.85), int(height * 1.5)
 
     def draw(self, screen, offset_x=0, offset_y=0):
         # Calculate screen position based on original position and offset
@@ -33,24 +57,40 @@ class Trash:
             screen.blit(self.image, (screen_x - self.image_offset_x, 
                                    screen_y - self.image_offset_y))
 
+    def get_image_rect(self):
+        """Return the area covered by the trash image, in world coordinates."""
+        return pygame.Rect(self.original_x - self.image_offset_x, self.original_y - self.image_offset_y,
+                           self.image.get_width(), self.image.get_height())
+
 class TrashSpawner:
-    def __init__(self, spawn_area_width=800, spawn_area_height=600, max_trash=30, data_book=None):
+    def __init__(self, spawn_area_width=800, spawn_area_height=600, max_trash=30, data_book=None, clock=None,
+                 rng=None):
         self.spawn_area_width = spawn_area_width
         self.spawn_area_height = spawn_area_height
         self.max_trash = max_trash
-        self.trash_list = []
+        self.clock = clock or pygame.time.get_ticks  # milliseconds, the game passes its simulation clock
+        self.rng = rng or random.Random()  # seeded per session so a game can be played again exactly
+        self.trash_list = SpatialHash(cell_size=128)  # trash indexed by world position
         self.score = 0
-        self.last_spawn_time = pygame.time.get_ticks()
+        self.last_spawn_time = self.clock()
         self.spawn_delay = 1000  # 1 second between spawns
         self.recent_collections = []  # List of recently collected trash for display
         self.min_trash = 15
         self.spawn_cycle = 3000  # 3 seconds
-        self.despawn_time = 10000  # 10 seconds
+        self.despawn_time = 10000  # 10 seconds, None to keep trash until it is collected
+        self.expiry = TimingWheel(tick_ms=100, slots=128, start=self.clock())  # trash -> despawn deadline
+        self.free_trash = []  # collected and despawned Trash, reused by add_trash
         self.screen_offset_x = 0
         self.screen_offset_y = 0
         self.display_info = False  # status to show trash info
         self.current_trash_id = None  # ID of the current trash
         self.data_book = data_book  # Instance of DataBook
+        self.record_changes = False  # set by the dirty rect renderer
+        self.changed_rects = []  # world areas where trash appeared or disappeared
+
+    def reseed(self, seed):
+        """Seed the random numbers of the spawner, so a game spawns the same trash every time it is played."""
+        self.rng.seed(seed)
 
     def update_screen_offset(self, x, y):
         """Update screen offset."""
@@ -58,18 +98,71 @@ class TrashSpawner:
         self.screen_offset_y = y
 
     def spawn_trash(self, count=1):
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock()
         if current_time - self.last_spawn_time >= self.spawn_delay:
-            needed_trash = max(0, self.min_trash - len(self.trash_list))
-            spawn_count = random.randint(needed_trash, needed_trash + 3)
+            needed_trash = max(0, self.min_trash - self.trash_count())
+            spawn_count = self.rng.randint(needed_trash, needed_trash + 3)
             
             for _ in range(spawn_count):
-                if len(self.trash_list) < self.max_trash:
-                    x = random.randint(0, self.spawn_area_width - 30)
-                    y = random.randint(0, self.spawn_area_height - 30)
-                    self.trash_list.append(Trash(x, y))
+                if self.trash_count() < self.max_trash:
+                    x = self.rng.randint(0, self.spawn_area_width - 30)
+                    y = self.rng.randint(0, self.spawn_area_height - 30)
+                    self.add_trash(x, y, catalogue.choose(self.rng))
             self.last_spawn_time = current_time
 
+    def add_trash(self, x, y, info):
+        """
+        Put one trash into the world.
+
+        :param x: World x of the hitbox.
+        :param y: World y of the hitbox.
+        :param info: Trash type from the catalogue.
+        """
+        trash = self._take_trash(x, y, info)
+        self.trash_list.insert(trash, x, y, trash.width, trash.height)
+        if self.despawn_time is not None:
+            self.expiry.schedule(trash, self.clock() + self.despawn_time)
+        if self.record_changes:
+            self.changed_rects.append(trash.get_image_rect())
+
+    def _take_trash(self, x, y, info):
+        """Return a Trash for a new spawn, reusing a free one when there is one."""
+        if self.free_trash:
+            trash = self.free_trash.pop()
+            trash.reset(x, y, info=info)
+            return trash
+        return Trash(x, y, info=info)
+
+    def remove_trash(self, trash):
+        """
+        Take one trash out of the world and keep it for reuse.
+        """
+        self.trash_list.remove(trash)
+        self.expiry.cancel(trash)
+        if self.record_changes:
+            self.changed_rects.append(trash.get_image_rect())
+        self.free_trash.append(trash)
+
+    def despawn_expired(self):
+        """
+        Remove the trash that has been lying around for despawn_time.
+        Only the timing wheel slots of the time that passed are looked at.
+
+        :return: Number of trash removed.
+        """
+        expired = self.expiry.advance(self.clock())
+        for trash in expired:
+            self.remove_trash(trash)
+        return len(expired)
+
+    def trash_count(self):
+        """Return how many trash are in the world."""
+        return len(self.trash_list)
+
+    def trash_positions(self):
+        """Return (x, y, width, height) world hitboxes of all trash."""
+        return [(trash.original_x, trash.original_y, trash.width, trash.height) for trash in self.trash_list]
+
     def draw(self, screen, offset_x=0, offset_y=0, beach=True):
         """
         Draw trash and hitbox for debug (optional).
@@ -82,30 +175,36 @@ class TrashSpawner:
     def check_collision(self, character, trash_info):
         """
         Check collision with the fixed hitbox of the character.
+        Only the grid cells under the hitbox are looked at.
         """
         char_hitbox = character.get_hitbox()
-        for trash in self.trash_list[:]:
-            # Calculate the actual position of the trash on the screen
-            trash_screen_pos = (
-                trash.original_x - self.screen_offset_x,
-                trash.original_y - self.screen_offset_y
-            )
-            trash_rect = pygame.Rect(
-                trash_screen_pos[0],
-                trash_screen_pos[1],
-                trash.width,
-                trash.height
-            )
-            
-            if char_hitbox.colliderect(trash_rect):
-                self.score += trash.info['points']
-                trash_info.collect_trash(trash.info)
-                self.trash_list.remove(trash)
-                self.recent_collections.append((trash.info['points'], pygame.time.get_ticks()))
-                self.display_info = True  # Show trash info box
-                self.current_trash_id = trash.info['id']  # Save ID of the current trash
-                if self.data_book:
-                    self.data_book.collect_trash(trash.info['id'])  # Update collection status in DataBook
+        # Move the hitbox into world coordinates instead of moving every trash onto the screen
+        hits = self.trash_list.query(
+            char_hitbox.x + self.screen_offset_x,
+            char_hitbox.y + self.screen_offset_y,
+            char_hitbox.width,
+            char_hitbox.height
+        )
+        for trash in hits:
+            self.score += trash.info['points']
+            trash_info.collect_trash(trash.info)
+            self.remove_trash(trash)
+            self.recent_collections.append((trash.info['points'], self.clock()))
+            audio.play("collect")
+            self.display_info = True  # Show trash info box
+            self.current_trash_id = trash.info['id']  # Save ID of the current trash
+            if self.data_book:
+                self.data_book.collect_trash(trash.info['id'])  # Update collection status in DataBook
+
+    def pop_changed_rects(self):
+        """
+        Return the screen areas where trash appeared or disappeared since the last call.
+
+        :return: List of pygame Rects in screen coordinates.
+        """
+        rects = [rect.move(-self.screen_offset_x, -self.screen_offset_y) for rect in self.changed_rects]
+        self.changed_rects = []
+        return rects
 
     def create_collection_token(self, trash_info):
         """
@@ -130,13 +229,13 @@ class TrashSpawner:
         return self.score
 
     def update_score_display(self, screen, dt):
-        current_time = pygame.time.get_ticks()
-        font = pygame.font.Font(None, 24)
+        current_time = self.clock()
+        font = get_font(None, 24)
         
         for i, (score, time_created) in enumerate(self.recent_collections):
             if current_time - time_created > 1000:  # Display for 1 second
                 self.recent_collections.remove((score, time_created))
                 continue
                 
-            text = font.render(f"+{score}", True, (0, 255, 0))
+            text = render_text(f"+{score}", font, (0, 255, 0))
             screen.blit(text, (10, 40 + i * 25))
@@ -0,0 +1,43 @@
+import pygame
+from assets import assets
+
+# Shared sprites: every object drawn with the same (image, size, flip) uses one Surface
+_sprites = {}  # (image path, size, flip) -> scaled Surface
+
+
+def get_sprite(image_path, size, flip=False):
+    """
+    Get the shared Surface for an image at a given size.
+
+    The image is loaded, scaled and converted to the display format (or taken
+    from the asset pack) only the first time a (image, size, flip) combination
+    is asked for. Callers must
+    not draw onto the returned Surface because it is shared.
+
+    :param image_path: Path to the image file.
+    :param size: Tuple (width, height) of the wanted sprite.
+    :param flip: True to mirror the sprite horizontally.
+    :return: The cached pygame Surface.
+    """
+    key = (image_path, tuple(size), flip)
+    sprite = _sprites.get(key)
+    if sprite is None:
+        sprite = assets.image(image_path, size=key[1])
+        if flip:
+            sprite = pygame.transform.flip(sprite, True, False)
+        _sprites[key] = sprite
+    return sprite
+
+
+def clear_sprites():
+    """
+    Forget every cached sprite, e.g. after the display mode has changed.
+    """
+    _sprites.clear()
+
+
+def sprite_count():
+    """
+    Return the number of distinct sprites kept in memory.
+    """
+    return len(_sprites)
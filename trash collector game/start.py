@@ -1,5 +1,7 @@
 import pygame
 from achievement import Achievement
+from fonts import get_font, render_text
+from gradient import get_gradient, MENU_GRADIENT
 
 class StartScreen:
     def __init__(self, screen_width, screen_height):
@@ -23,20 +25,14 @@ class StartScreen:
 
         :param screen: The pygame display surface.
         """
-        # Background gradient
-        for i in range(screen.get_height()):
-            color = (
-                int(135 * (1 - i/screen.get_height())),
-                int(206 * (1 - i/screen.get_height())),
-                int(250 * (1 - i/screen.get_height()))
-            )
-            pygame.draw.line(screen, color, (0, i), (screen.get_width(), i))
+        # Background gradient, built once per window size
+        screen.blit(get_gradient(screen.get_size(), MENU_GRADIENT), (0, 0))
 
         # Title with shadow
-        font = pygame.font.Font(pygame.font.match_font('Tahoma'), 60)
-        title = font.render("Save the ocean", True, (0, 0, 0))
+        font = get_font('Tahoma', 60)
+        title = render_text("Save the ocean", font, (0, 0, 0))
         screen.blit(title, (self.screen_width // 2 - title.get_width() // 2 + 2, 52))
-        title = font.render("Save the ocean", True, (255, 255, 255))
+        title = render_text("Save the ocean", font, (255, 255, 255))
         screen.blit(title, (self.screen_width // 2 - title.get_width() // 2, 50))
 
         # Buttons with gradients and hover effects
@@ -52,14 +48,14 @@ class StartScreen:
         pygame.draw.rect(screen, color, button, border_radius=15)
         pygame.draw.rect(screen, (255, 255, 255), button, 3, border_radius=15)
         
-        font = pygame.font.Font(pygame.font.match_font('Tahoma'), 30)  
-        text_surf = font.render(text, True, (255, 255, 255))
+        font = get_font('Tahoma', 30)  
+        text_surf = render_text(text, font, (255, 255, 255))
         screen.blit(text_surf, (button.centerx - text_surf.get_width() // 2,
                                button.centery - text_surf.get_height() // 2))
         
         if tick:
-            tick_font = pygame.font.Font(pygame.font.match_font('Tahoma'), 40)
-            tick_text = tick_font.render("✔", True, (255, 255, 255))
+            tick_font = get_font('Tahoma', 40)
+            tick_text = render_text("✔", tick_font, (255, 255, 255))
             screen.blit(tick_text, (button.right - 50, button.top + 10))
 
     def draw_small_button(self, screen, button, text, mouse_pos):
@@ -68,50 +64,46 @@ class StartScreen:
         pygame.draw.rect(screen, color, button, border_radius=15)
         pygame.draw.rect(screen, (255, 255, 255), button, 3, border_radius=15)
         
-        font = pygame.font.Font(pygame.font.match_font('Tahoma'), 30)
-        text_surf = font.render(text, True, (255, 255, 255))
+        font = get_font('Tahoma', 30)
+        text_surf = render_text(text, font, (255, 255, 255))
         screen.blit(text_surf, (button.centerx - text_surf.get_width() // 2,
                                button.centery - text_surf.get_height() // 2))
 
-    def start_button_clicked(self):
+    def start_button_clicked(self, frame):
         """
         Check if the start button is clicked.
 
-        :return: True if the start button is clicked, False otherwise.
+        :param frame: The InputFrame of this frame.
+        :return: True if the start button was clicked this frame, False otherwise.
         """
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_pressed = pygame.mouse.get_pressed()
-        return self.start_button.collidepoint(mouse_pos) and mouse_pressed[0]
+        return frame.clicked(self.start_button)
 
-    def achievement_button_clicked(self):
+    def achievement_button_clicked(self, frame):
         """
         Check if the achievement button is clicked.
 
-        :return: True if the achievement button is clicked, False otherwise.
+        :param frame: The InputFrame of this frame.
+        :return: True if the achievement button was clicked this frame, False otherwise.
         """
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_pressed = pygame.mouse.get_pressed()
-        return self.achievement_button.collidepoint(mouse_pos) and mouse_pressed[0]
+        return frame.clicked(self.achievement_button)
 
-    def help_button_clicked(self):
+    def help_button_clicked(self, frame):
         """
         Check if the help button is clicked.
 
-        :return: True if the help button is clicked, False otherwise.
+        :param frame: The InputFrame of this frame.
+        :return: True if the help button was clicked this frame, False otherwise.
         """
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_pressed = pygame.mouse.get_pressed()
-        return self.help_button.collidepoint(mouse_pos) and mouse_pressed[0]
+        return frame.clicked(self.help_button)
 
-    def skip_video_button_clicked(self):
+    def skip_video_button_clicked(self, frame):
         """
         Check if the skip video button is clicked.
 
-        :return: True if the skip video button is clicked, False otherwise.
+        :param frame: The InputFrame of this frame.
+        :return: True if the skip video button was clicked this frame, False otherwise.
         """
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_pressed = pygame.mouse.get_pressed()
-        if self.skip_video_button.collidepoint(mouse_pos) and mouse_pressed[0]:
+        if frame.clicked(self.skip_video_button):
             self.skip_video = not self.skip_video
             return True
         return False
@@ -0,0 +1,41 @@
+import time
+
+
+class StartupTrace:
+    def __init__(self, started=None):
+        """
+        Record how long each phase of the game start takes.
+
+        A phase ends when mark() is called with its name and started where the
+        previous one ended, so the phases add up to the whole startup.
+
+        :param started: time.perf_counter() value the first phase starts at, now if None.
+        """
+        self.started = time.perf_counter() if started is None else started
+        self.last = self.started
+        self.phases = []  # (name, milliseconds) in order
+
+    def mark(self, name):
+        """End the current phase and start the next one."""
+        now = time.perf_counter()
+        self.phases.append((name, (now - self.last) * 1000))
+        self.last = now
+
+    def elapsed_ms(self):
+        """Milliseconds from the start to the last mark."""
+        return (self.last - self.started) * 1000
+
+    def over_budget(self, budget_ms):
+        """True if the phases so far took longer than budget_ms, never if budget_ms is None."""
+        return budget_ms is not None and self.elapsed_ms() > budget_ms
+
+    def report(self):
+        """
+        Return the phases as text, one line each, slowest marked with a star.
+
+        :return: Multi-line string.
+        """
+        slowest = max(ms for _, ms in self.phases) if self.phases else 0
+        lines = [f"  {name:20} {ms:8.1f} ms{' *' if ms == slowest else ''}" for name, ms in self.phases]
+        lines.append(f"  {'total':20} {self.elapsed_ms():8.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,287 @@
+import atexit
+import heapq
+import json
+import os
+import queue
+import threading
+from collections import deque
+
+
+class AchievementSummary:
+    def __init__(self, recent_size=100, top_size=100):
+        """
+        Numbers about all saved scores that are kept up to date on every insert,
+        so nothing ever has to read the whole history.
+
+        :param recent_size: How many of the newest records are kept.
+        :param top_size: How many of the best scores are kept (the top-K leaderboard).
+        """
+        self.recent_size = recent_size
+        self.top_size = top_size
+        self.count = 0
+        self.best = None
+        self.total = 0  # sum of all scores, for the average
+        self.recent = deque(maxlen=recent_size)  # (timestamp, score), oldest first
+        self.top = []  # min-heap of (score, timestamp), the worst of the best is top[0]
+        self.day_best = {}  # "YYYY-MM-DD" -> best score of that day
+        self.version = 0  # changes on every insert or clear, for caches built on the summary
+
+    def add(self, timestamp, score):
+        self.count += 1
+        self.total += score
+        if self.best is None or score > self.best:
+            self.best = score
+        self.recent.append((timestamp, score))
+        if len(self.top) < self.top_size:
+            heapq.heappush(self.top, (score, timestamp))
+        elif (score, timestamp) > self.top[0]:
+            heapq.heapreplace(self.top, (score, timestamp))
+        day = timestamp[:10]
+        if score > self.day_best.get(day, -1):
+            self.day_best[day] = score
+        self.version += 1
+
+    def clear(self):
+        self.count = 0
+        self.best = None
+        self.total = 0
+        self.recent.clear()
+        self.top = []
+        self.day_best = {}
+        self.version += 1
+
+    @property
+    def average(self):
+        """Average score of all games."""
+        return self.total / self.count if self.count else 0.0
+
+    def recent_average(self, games=10):
+        """Average score of the last games (running average)."""
+        last = list(self.recent)[-games:]
+        return sum(score for _, score in last) / len(last) if last else 0.0
+
+    def leaderboard(self):
+        """Return the top-K records as (timestamp, score), best first."""
+        return [(timestamp, score) for score, timestamp in sorted(self.top, reverse=True)]
+
+    def to_json(self):
+        return {"count": self.count, "best": self.best, "total": self.total, "recent": list(self.recent),
+                "top": self.top, "day_best": self.day_best}
+
+    def load_json(self, data):
+        self.count = data["count"]
+        self.best = data["best"]
+        self.total = data["total"]
+        self.recent = deque((tuple(record) for record in data["recent"]), maxlen=self.recent_size)
+        self.top = [tuple(record) for record in data["top"]]
+        heapq.heapify(self.top)
+        self.day_best = dict(data["day_best"])
+        self.version += 1
+
+
+class AchievementStore:
+    def __init__(self, path="achievements.jsonl", legacy_path=None, index_every=50, recent_size=100):
+        """
+        Initialize the append-only score store.
+
+        Every score is one JSON line appended to the log. Writes go through a
+        queue to a background thread, so saving never waits for the disk. An
+        index file holds the summary and how far into the log it reaches; at
+        startup only the index and the lines after it are read. A crash can
+        at most cut off the last line, which is dropped on the next start.
+
+        After a clear the writer compacts the log: the records before the
+        last clear are dropped and the live ones are kept as they are, so
+        no score that still counts is ever lost.
+
+        :param path: The JSON lines log.
+        :param legacy_path: Old achievements.json (timestamp -> score), imported once if the log does not exist.
+        :param index_every: Write the index after this many new records.
+        :param recent_size: How many of the newest records are kept in memory.
+        """
+        self.path = path
+        self.index_path = os.path.splitext(path)[0] + ".index.json"
+        self.index_every = index_every
+        self.recent_size = recent_size
+        self.summary = AchievementSummary(recent_size)  # what the game sees, updated right away
+        self.queue = queue.Queue()
+        self.writer = None
+        self.closed = False
+
+        if not os.path.exists(path) and legacy_path and os.path.exists(legacy_path):
+            self._import_legacy(legacy_path)
+        self.dead_records = 0  # records before the last clear, dropped by compaction
+        self.unindexed = 0  # records in the log after the offset the index covers
+        self.offset = self._load()
+
+        # The writer thread keeps its own copy so the index always matches the bytes on disk
+        self.disk_summary = AchievementSummary(recent_size)
+        self.disk_summary.load_json(self.summary.to_json())
+
+        self.writer = threading.Thread(target=self._write_loop, name="achievement-writer", daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    def _import_legacy(self, legacy_path):
+        """Turn the old rewrite-everything JSON file into a log, once."""
+        with open(legacy_path, 'r') as f:
+            achievements = json.load(f)
+        # Written next to the log and renamed, so a crash never leaves half a log behind
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w') as f:
+            for timestamp, score in achievements.items():
+                f.write(json.dumps({"time": timestamp, "score": score}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def _load(self):
+        """
+        Read the index and the log lines written after it.
+
+        :return: Byte offset of the end of the last complete line.
+        """
+        if not os.path.exists(self.path):
+            return 0
+        stat = os.stat(self.path)
+        offset = 0
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+            # An index of another file (the log was replaced by compaction) or of more bytes is not used
+            if index["inode"] == stat.st_ino and index["offset"] <= stat.st_size:
+                self.summary.load_json(index["summary"])
+                offset = index["offset"]
+        except (OSError, ValueError, KeyError):
+            # No index, a broken one or one from an older version: read the whole log once
+            self.summary.clear()
+            offset = 0
+        size = stat.st_size
+
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # cut off by a crash, dropped below
+                offset += len(line)
+                self.unindexed += 1
+                if self._apply(self.summary, line):
+                    self.dead_records += 1  # compacted after the next save
+        if offset < size:
+            os.truncate(self.path, offset)
+        return offset
+
+    @staticmethod
+    def _apply(summary, line):
+        """
+        Apply one log line to a summary.
+
+        :return: True if the line was a clear.
+        """
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return False
+        if record.get("clear"):
+            summary.clear()
+            return True
+        summary.add(record["time"], record["score"])
+        return False
+
+    def add(self, timestamp, score):
+        """
+        Save a score. Returns at once, the writer thread appends it to the log.
+
+        :param timestamp: Text like "2024-05-01 14:03:22".
+        :param score: Total score of the game.
+        """
+        self.summary.add(timestamp, score)
+        self.queue.put({"time": timestamp, "score": score})
+
+    def clear(self):
+        """Forget every score. The log is compacted to nothing in the background."""
+        self.summary.clear()
+        self.queue.put({"clear": True})
+
+    def _write_loop(self):
+        if self.unindexed:
+            self._write_index()  # so the lines read at startup are not read again next time
+        stop = False
+        while not stop:
+            batch = [self.queue.get()]
+            # Everything queued meanwhile goes out in the same write
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            batch = [record for record in batch if record is not None]
+
+            if batch:
+                data = b"".join(json.dumps(record).encode() + b"\n" for record in batch)
+                with open(self.path, 'ab') as log:
+                    log.write(data)
+                    log.flush()
+                    os.fsync(log.fileno())
+                self.offset += len(data)
+                for record in batch:
+                    if record.get("clear"):
+                        self.dead_records += self.disk_summary.count + 1
+                        self.disk_summary.clear()
+                    else:
+                        self.disk_summary.add(record["time"], record["score"])
+                self.unindexed += len(batch)
+
+            if self.dead_records:
+                self._compact()
+            elif self.unindexed >= self.index_every or (stop and self.unindexed):
+                self._write_index()
+
+    def _compact(self):
+        """
+        Rewrite the log without the records before the last clear, atomically.
+
+        The live records are copied line by line, the summary stays in the index.
+        """
+        live = 0  # byte offset just after the last clear
+        with open(self.path, 'rb') as log:
+            position = 0
+            for line in log:
+                position += len(line)
+                if position > self.offset:
+                    break
+                if b'"clear"' in line and json.loads(line).get("clear"):
+                    live = position
+
+            temp_path = self.path + ".tmp"
+            with open(temp_path, 'wb') as f:
+                log.seek(live)
+                position = live
+                for line in log:
+                    if position + len(line) > self.offset:
+                        break
+                    f.write(line)
+                    position += len(line)
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self.offset -= live
+        self.dead_records = 0
+        self._write_index()
+
+    def _write_index(self):
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({"inode": os.stat(self.path).st_ino, "offset": self.offset,
+                       "summary": self.disk_summary.to_json()}, f)
+        os.replace(temp_path, self.index_path)
+        self.unindexed = 0
+
+    def close(self):
+        """Write everything still queued and the index. Called at exit."""
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.writer.join()
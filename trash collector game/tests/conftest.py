@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pygame
+import pytest
+
+# The game modules are imported by bare name, like main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+@pytest.fixture
+def screen():
+    """A dummy display, needed by convert() and convert_alpha()."""
+    pygame.init()
+    yield pygame.display.set_mode((800, 600))
+    pygame.quit()
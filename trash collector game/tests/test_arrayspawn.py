@@ -0,0 +1,19 @@
+import numpy as np
+import pygame
+from arrayspawn import ArrayTrashSpawner
+
+BACKGROUND = (0, 0, 255)
+
+
+def test_trash_image_keeps_transparency(screen):
+    image, _, _ = ArrayTrashSpawner()._image(100, 100)
+    alpha = pygame.surfarray.array_alpha(image)
+    assert alpha[0, 0] == 0  # the corner of the sprite is transparent
+    opaque = tuple(int(i) for i in np.argwhere(alpha == 255)[0])
+
+    target = pygame.Surface(image.get_size())
+    target.fill(BACKGROUND)
+    target.blit(image, (0, 0))
+
+    assert target.get_at((0, 0))[:3] == BACKGROUND
+    assert target.get_at(opaque) == image.get_at(opaque)  # the bag itself is drawn
@@ -0,0 +1,51 @@
+import random
+from chunks import ChunkedTrashSpawner
+
+
+def chunk_contents(spawner):
+    return {key: sorted((trash.original_x, trash.original_y, trash.info["id"], spawn_time)
+                        for trash, spawn_time in chunk.trash.items())
+            for key, chunk in spawner.chunks.items()}
+
+
+def play(seed, warm_up):
+    now = [0]
+    spawner = ChunkedTrashSpawner(5000, 5000, max_trash=200, clock=lambda: now[0], rng=random.Random())
+    for _ in range(warm_up):  # trash of an earlier game, gone after reseed()
+        now[0] += 500
+        spawner.spawn_trash()
+    spawner.reseed(seed)
+    now[0] = 0  # the game resets its simulation clock with the seed
+    for step in range(40):
+        now[0] += 500
+        spawner.update_screen_offset(step * 60, step * 40)
+        spawner.spawn_trash()
+    return spawner
+
+
+def test_reseeded_spawners_make_the_same_chunks(screen):
+    first, second = play(7, warm_up=0), play(7, warm_up=25)
+    assert first.world_seed == second.world_seed
+    assert chunk_contents(first) == chunk_contents(second)
+    assert sum(len(chunk.trash) for chunk in first.chunks.values()) > 0
+    assert chunk_contents(play(8, warm_up=0)) != chunk_contents(first)
+
+
+def test_nothing_expires_while_the_info_box_is_shown(screen):
+    now = [0]
+    spawner = ChunkedTrashSpawner(2048, 2048, max_trash=60, clock=lambda: now[0], rng=random.Random(1))
+    now[0] = 1000
+    spawner.spawn_trash()
+    spawned = len(spawner.trash_chunk)
+    assert spawned > 0
+
+    spawner.display_info = True
+    now[0] += spawner.despawn_time * 2
+    spawner.spawn_trash()
+    assert len(spawner.trash_chunk) >= spawned
+    assert min(spawn_time for chunk in spawner.chunks.values() for spawn_time in chunk.trash.values()) == 1000
+
+    spawner.display_info = False
+    spawner.spawn_trash()
+    assert all(spawn_time > now[0] - spawner.despawn_time
+               for chunk in spawner.chunks.values() for spawn_time in chunk.trash.values())
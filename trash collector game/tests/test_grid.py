@@ -0,0 +1,67 @@
+import random
+from grid import SpatialHash
+
+
+def overlaps(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+def brute_force(rects, query):
+    return sorted(item for item, rect in rects.items() if overlaps(rect, query))
+
+
+def covered_cells(grid, rects):
+    return {key for rect in rects.values() for key in grid._cell_range(*rect)}
+
+
+def test_queries_match_a_brute_force_scan():
+    rng = random.Random(4)
+    grid = SpatialHash(cell_size=64)
+    rects = {}
+    for step in range(2000):
+        action = rng.random()
+        if action < 0.5 or not rects:
+            item = step
+        else:
+            item = rng.choice(list(rects))  # moved, or removed below
+        if action < 0.85:
+            # Negative coordinates, rectangles on cell edges and ones wider than a cell
+            rect = (rng.randint(-300, 300), rng.randint(-300, 300),
+                    rng.choice([1, 30, 64, 65, 200]), rng.randint(1, 150))
+            grid.insert(item, *rect)
+            rects[item] = rect
+        else:
+            grid.remove(item)
+            del rects[item]
+
+        query = (rng.randint(-350, 300), rng.randint(-350, 300), rng.randint(1, 300), rng.randint(1, 300))
+        assert sorted(grid.query(*query)) == brute_force(rects, query)
+        assert len(grid) == len(rects)
+    assert set(grid.cells) == covered_cells(grid, rects)
+
+
+def test_query_edges_are_exclusive():
+    grid = SpatialHash(cell_size=100)
+    grid.insert("a", 90, 90, 20, 20)  # on the corner of four cells
+    assert grid.query(110, 110, 50, 50) == []  # starts where a ends
+    assert grid.query(109, 109, 1, 1) == ["a"]
+    assert grid.query(-10, -10, 100, 100) == []
+    assert grid.query(-10, -10, 101, 101) == ["a"]
+    assert len(grid.cells) == 4
+
+
+def test_moving_and_removing_leave_no_empty_cells():
+    grid = SpatialHash(cell_size=50)
+    grid.insert("a", -120, -120, 10, 10)
+    grid.insert("b", 0, 0, 120, 10)
+    grid.insert("a", 500, 500, 10, 10)  # moved
+    assert grid.query(-130, -130, 30, 30) == []
+    assert grid.query(495, 495, 10, 10) == ["a"]
+    assert set(grid.cells) == {(10, 10), (0, 0), (1, 0), (2, 0)}
+
+    grid.remove("b")
+    grid.remove("a")
+    assert grid.cells == {}
+    assert len(grid) == 0
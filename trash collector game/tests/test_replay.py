@@ -0,0 +1,119 @@
+import random
+import pygame
+import pytest
+import main
+from inputs import InputFrame, PressedKeys
+from replay import InputRecorder, InputReplay, read_varint, unzigzag, write_varint, zigzag
+
+ROUTE = [pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP]
+
+
+def test_varint_and_zigzag_round_trip():
+    values = [0, 1, 127, 128, 300, 16383, 16384, 2 ** 31, 2 ** 64 - 1]
+    out = bytearray()
+    for value in values:
+        write_varint(out, value)
+    pos = 0
+    for value in values:
+        read, pos = read_varint(out, pos)
+        assert read == value
+    assert pos == len(out)
+    assert len(out[:1]) == 1 and out[0] == 0  # small numbers take one byte
+
+    for value in range(-1000, 1000):
+        assert unzigzag(zigzag(value)) == value
+    assert [zigzag(value) for value in (0, -1, 1, -2)] == [0, 1, 2, 3]
+
+
+def make_frames(count, seed=1):
+    """Frames with every kind of change, and runs of identical frames in between."""
+    rng = random.Random(seed)
+    frames = []
+    mouse = (400, 300)
+    for i in range(count):
+        events = []
+        if rng.random() < 0.5:  # otherwise the same as the previous frame
+            mouse = (max(0, mouse[0] + rng.randint(-40, 40)), max(0, mouse[1] + rng.randint(-40, 40)))
+            if rng.random() < 0.2:
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=rng.choice(ROUTE + [pygame.K_b]), mod=0))
+            if rng.random() < 0.1:
+                events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=mouse))
+        held = PressedKeys([ROUTE[i // 30 % len(ROUTE)]])
+        buttons = (i % 50 < 5, False, False)
+        frames.append((InputFrame(events, held, mouse, buttons, 0.0), rng.choice([16, 16, 17, 33])))
+    frames.append((InputFrame([pygame.event.Event(pygame.QUIT)], PressedKeys(), mouse, (False,) * 3, 0.0), 16))
+    return frames
+
+
+def test_recorded_frames_come_back_the_same(tmp_path):
+    path = str(tmp_path / "input.rec")
+    frames = make_frames(500)
+    recorder = InputRecorder(path, seed=12345, step_rate=60, backend="chunks")
+    for frame, frame_ms in frames:
+        recorder.record(frame, frame_ms)
+    recorder.close()
+
+    replay = InputReplay(path)
+    assert (replay.seed, replay.step_rate, replay.backend) == (12345, 60, "chunks")
+    for frame, frame_ms in frames:
+        read, read_ms = replay.next_frame()
+        assert read_ms == frame_ms
+        assert read.mouse_pos == frame.mouse_pos
+        assert read.mouse_buttons == frame.mouse_buttons
+        assert read.pressed == frame.pressed
+        assert read.clicks == frame.clicks
+        assert read.quit == frame.quit
+        assert all(read.keys[key] == frame.keys[key] for key in ROUTE)
+    assert replay.next_frame() is None
+
+
+class ScriptedInput:
+    """Plays the game like a person would: press start, walk around, close the info boxes."""
+    def __init__(self, start_button, count):
+        self.seed = 0
+        self.frames = 0
+        self.count = count
+        self.start_button = start_button
+
+    def next_frame(self):
+        if self.frames >= self.count:
+            return None
+        self.frames += 1
+        events = []
+        if self.frames == 3:
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=self.start_button.center))
+        if self.frames % 40 == 0:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, mod=0))
+        held = PressedKeys([ROUTE[self.frames // 90 % len(ROUTE)]])
+        return InputFrame(events, held, (400, 300), (False,) * 3, 0.0), [16, 17][self.frames % 2]
+
+
+def final_state(app):
+    trash = sorted((x, y, w, h) for x, y, w, h in app.trash_spawner.trash_positions())
+    return app.state, app.total_score, app.stepper.steps_run, app.character.x, app.character.y, trash
+
+
+@pytest.mark.parametrize("flags", [[], ["--array-trash"], ["--chunked-world"]])
+def test_a_recorded_game_replays_the_same(tmp_path, monkeypatch, flags):
+    monkeypatch.chdir(tmp_path)  # the end screen saves scores in the working directory
+    path = str(tmp_path / "game.rec")
+
+    app = main.App(main.parse_args(["--headless", "--seed", "7", "--record", path] + flags))
+    app.skip_video = True
+    app.replay = ScriptedInput(app.start_screen.start_button, 900)
+    app.run()
+    played = final_state(app)
+    assert played[0] == main.STATE_DAY1 and played[2] > 0
+
+    app = main.App(main.parse_args(["--headless", "--replay", path] + flags))
+    app.skip_video = True
+    app.run()
+    assert final_state(app) == played
+
+
+def test_a_replay_with_another_backend_is_refused(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "game.rec")
+    InputRecorder(path, seed=1, backend="chunks").close()
+    with pytest.raises(SystemExit, match="--chunked-world"):
+        main.App(main.parse_args(["--headless", "--replay", path]))
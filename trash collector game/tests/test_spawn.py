@@ -0,0 +1,37 @@
+from catalogue import catalogue
+from spawn import TrashSpawner
+
+
+def test_removed_trash_is_reused_without_its_old_state(screen):
+    now = [0]
+    spawner = TrashSpawner(2000, 2000, clock=lambda: now[0])
+    first, second = catalogue.types[0], catalogue.types[1]
+    spawner.add_trash(10, 20, first)
+    trash = next(iter(spawner.trash_list))
+    spawner.remove_trash(trash)
+    assert spawner.trash_count() == 0
+    assert trash not in spawner.expiry
+
+    now[0] = 5000
+    spawner.add_trash(1500, 1200, second)
+    assert next(iter(spawner.trash_list)) is trash  # taken from the free list
+    assert (trash.original_x, trash.original_y) == (1500, 1200)
+    assert trash.rect.topleft == (1500, 1200)
+    assert trash.info is second
+    assert spawner.trash_list.query(0, 0, 200, 200) == []
+    assert spawner.trash_list.query(1500, 1200, 10, 10) == [trash]
+
+    # The deadline is the one of the new spawn, not of the first
+    assert spawner.expiry.advance(5000 + spawner.despawn_time - 1) == []
+    assert spawner.expiry.advance(5000 + spawner.despawn_time) == [trash]
+
+
+def test_despawned_trash_goes_back_to_the_pool(screen):
+    now = [0]
+    spawner = TrashSpawner(2000, 2000, clock=lambda: now[0])
+    for i in range(5):
+        spawner.add_trash(100 * i, 100, catalogue.types[0])
+    now[0] = spawner.despawn_time
+    assert spawner.despawn_expired() == 5
+    assert spawner.trash_count() == 0
+    assert len(spawner.free_trash) == 5
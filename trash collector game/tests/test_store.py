@@ -0,0 +1,54 @@
+import json
+import os
+from store import AchievementStore
+
+
+def read_log(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_compaction_keeps_every_live_record(tmp_path):
+    path = str(tmp_path / "achievements.jsonl")
+    store = AchievementStore(path)
+    for i in range(40):
+        store.add("2024-05-01 10:00:00", i)
+    store.clear()
+    for i in range(300):
+        store.add(f"2024-05-02 10:00:{i % 60:02d}", i)
+    store.close()
+    records = read_log(path)
+    assert len(records) == 300  # the 40 dead records and the clear are gone
+    assert [record["score"] for record in records] == list(range(300))
+
+    os.remove(os.path.splitext(path)[0] + ".index.json")
+    reopened = AchievementStore(path)
+    reopened.close()
+    assert reopened.summary.count == 300
+    assert reopened.summary.leaderboard() == store.summary.leaderboard()
+
+
+def test_no_record_is_dropped_without_a_clear(tmp_path):
+    path = str(tmp_path / "achievements.jsonl")
+    store = AchievementStore(path, index_every=7)
+    for i in range(2000):
+        store.add("2024-05-01 10:00:00", i)
+    store.close()
+    assert len(read_log(path)) == 2000
+
+    reopened = AchievementStore(path)
+    reopened.close()
+    assert reopened.summary.count == 2000
+    assert reopened.summary.total == sum(range(2000))
+
+
+def test_legacy_file_is_imported(tmp_path):
+    legacy_path = tmp_path / "achievements.json"
+    legacy_path.write_text(json.dumps({"2024-05-01 10:00:00": 3, "2024-05-02 10:00:00": 7}))
+    path = str(tmp_path / "achievements.jsonl")
+
+    store = AchievementStore(path, legacy_path=str(legacy_path))
+    store.close()
+    assert store.summary.count == 2
+    assert store.summary.best == 7
+    assert not os.path.exists(path + ".tmp")
@@ -0,0 +1,17 @@
+from timestep import FixedTimestep
+
+
+def test_a_long_frame_is_capped():
+    stepper = FixedTimestep(step_rate=60, max_frame_time=0.25)
+    assert len(list(stepper.steps(10.0))) == 15  # a video length frame still only catches up a quarter second
+    assert 0.0 <= stepper.alpha < 1.0
+
+
+def test_alpha_stays_at_most_one_when_steps_are_cut_short():
+    stepper = FixedTimestep(step_rate=60)
+    for _ in stepper.steps(0.2):
+        break  # like the game loop when the day ends
+    assert stepper.accumulator > stepper.step
+    assert stepper.alpha == 1.0
+    stepper.reset()
+    assert stepper.alpha == 0.0
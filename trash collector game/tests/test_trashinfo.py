@@ -0,0 +1,21 @@
+from trashinfo import TrashImageCache
+
+
+def test_detail_images_are_bounded(screen):
+    cache = TrashImageCache(max_details=2)
+    first = cache.detail(1)
+    cache.detail(2)
+    assert cache.detail(1) is first  # shown again, so it is the most recent
+    cache.detail(3)
+    assert list(cache.details) == [1, 3]
+    assert first.get_size() == TrashImageCache.DETAIL_SIZE
+
+
+def test_fill_keeps_only_one_page_of_thumbnails(screen):
+    cache = TrashImageCache()
+    cache.fill([1, 2])
+    assert cache.thumbnail(2).get_size() == TrashImageCache.THUMBNAIL_SIZE
+    cache.fill([3, 4], background=True)
+    cache.thumbnail(3)
+    cache.loader.join()  # 4 may still be on its way
+    assert set(cache.thumbnails) | set(cache.scaled) == {3, 4}
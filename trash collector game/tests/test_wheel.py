@@ -0,0 +1,65 @@
+import random
+from wheel import TimingWheel
+
+
+def test_items_expire_in_deadline_order_and_not_before():
+    wheel = TimingWheel(tick_ms=100, slots=8)
+    for name, deadline in [("c", 350), ("a", 120), ("b", 199), ("d", 360)]:
+        wheel.schedule(name, deadline)
+    assert wheel.advance(119) == []
+    assert wheel.advance(199) == ["a", "b"]
+    assert wheel.advance(355) == ["c"]  # d is in the same slot but later
+    assert "d" in wheel
+    assert wheel.advance(360) == ["d"]
+    assert len(wheel) == 0
+
+
+def test_past_and_current_deadlines_expire_on_the_next_advance():
+    wheel = TimingWheel(tick_ms=100, slots=8, start=1000)
+    wheel.schedule("past", 40)
+    wheel.schedule("now", 1000)
+    wheel.schedule("later in this tick", 1050)
+    assert sorted(wheel.advance(1000)) == ["now", "past"]
+    assert wheel.advance(1049) == []
+    assert wheel.advance(1050) == ["later in this tick"]
+
+
+def test_deadlines_more_than_one_turn_ahead_wait_for_their_turn():
+    wheel = TimingWheel(tick_ms=10, slots=4)  # one turn is 40 ms
+    wheel.schedule("far", 125)
+    wheel.schedule("near", 5)
+    for now in range(0, 125, 5):
+        assert "far" not in wheel.advance(now)
+    assert wheel.advance(125) == ["far"]
+
+
+def test_a_long_jump_looks_at_every_slot_once():
+    wheel = TimingWheel(tick_ms=10, slots=4)
+    wheel.schedule("a", 15)
+    wheel.schedule("b", 38)
+    wheel.schedule("c", 1000)  # beyond the jump, must stay
+    assert sorted(wheel.advance(500)) == ["a", "b"]
+    assert "c" in wheel
+    assert wheel.advance(999) == []
+    assert wheel.advance(1000) == ["c"]
+
+
+def test_matches_a_brute_force_scan_over_many_turns():
+    rng = random.Random(3)
+    wheel = TimingWheel(tick_ms=16, slots=16)
+    waiting = {}
+    now = 0
+    for item in range(3000):
+        if rng.random() < 0.1 and waiting:
+            cancelled = rng.choice(list(waiting))
+            wheel.cancel(cancelled)
+            del waiting[cancelled]
+        deadline = now + rng.randint(-50, 1000)  # some in the past, some turns ahead
+        wheel.schedule(item, deadline)
+        waiting[item] = deadline
+        now += rng.choice([0, 1, 7, 16, 40, 300])
+        expired = wheel.advance(now)
+        assert sorted(expired) == sorted(i for i, d in waiting.items() if d <= now)
+        for i in expired:
+            del waiting[i]
+        assert len(wheel) == len(waiting)
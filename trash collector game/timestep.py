@@ -0,0 +1,45 @@
+class FixedTimestep:
+    def __init__(self, step_rate=60, max_frame_time=0.25):
+        """
+        Initialize a fixed timestep accumulator.
+
+        The simulation always advances in steps of 1 / step_rate seconds, so it
+        behaves the same at any frame rate. A slow frame runs several steps to
+        catch up instead of slowing the game down.
+
+        :param step_rate: Simulation steps per second.
+        :param max_frame_time: Longest frame (in seconds) that is caught up in full,
+                               e.g. after the window was dragged or a video played.
+        """
+        self.step_rate = step_rate
+        self.step = 1.0 / step_rate
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+        self.steps_run = 0  # total steps ever run, the simulation clock
+
+    def reset(self):
+        """Drop leftover time, e.g. when a day starts. The simulation clock keeps counting."""
+        self.accumulator = 0.0
+
+    def steps(self, frame_time):
+        """
+        Add the real time of one frame and yield once per simulation step to run.
+
+        :param frame_time: Seconds since the previous frame.
+        """
+        self.accumulator += min(frame_time, self.max_frame_time)
+        while self.accumulator >= self.step:
+            self.accumulator -= self.step
+            self.steps_run += 1
+            yield self.steps_run
+
+    @property
+    def alpha(self):
+        """How far the renderer is between the last two simulation steps, from 0 to 1."""
+        return min(1.0, self.accumulator / self.step)
+
+    def ticks(self):
+        """
+        Simulation time in milliseconds, a drop-in for pygame.time.get_ticks().
+        """
+        return self.steps_run * 1000 // self.step_rate
@@ -1,22 +1,18 @@
 import os
+import struct
+import threading
+from collections import OrderedDict
 import pygame
+from assets import assets
+from fonts import get_font, render_text
+from catalogue import catalogue
 
 class TrashInfo:
     # path to resource folder
     resource_path = os.path.join(os.path.dirname(__file__), "resource")
     
-    TRASH_TYPES = [
-        {"id": 1, "image": os.path.join(resource_path, "trash1.png"), "points": 1},
-        {"id": 2, "image": os.path.join(resource_path, "trash2.png"), "points": 1},
-        {"id": 3, "image": os.path.join(resource_path, "trash3.png"), "points": 1},
-        {"id": 4, "image": os.path.join(resource_path, "trash4.png"), "points": 1},
-        {"id": 5, "image": os.path.join(resource_path, "trash5.png"), "points": 1},
-        {"id": 6, "image": os.path.join(resource_path, "trash6.png"), "points": 1},
-        {"id": 7, "image": os.path.join(resource_path, "trash7.png"), "points": 1},
-        {"id": 8, "image": os.path.join(resource_path, "trash8.png"), "points": 1},
-        {"id": 9, "image": os.path.join(resource_path, "trash9.png"), "points": 1},
-        {"id": 10, "image": os.path.join(resource_path, "trash10.png"), "points": 1}
-    ]
+    # Loaded from resource/trash.json, see catalogue.py. Entries are looked up by id through catalogue.get()
+    TRASH_TYPES = catalogue.types
     
     def __init__(self):
         # temporary storage for collected trash information
@@ -30,10 +26,10 @@ class TrashInfo:
         :param trash_id: The id of the trash item.
         :return: Image file name of the trash item or 'unknown.png' if not found.
         """
-        for trash in TrashInfo.TRASH_TYPES:
-            if trash["id"] == trash_id:
-                return trash["image"]
-        return os.path.join(TrashInfo.resource_path, "unknown.png")
+        trash = catalogue.get(trash_id)
+        if trash is None:
+            return os.path.join(TrashInfo.resource_path, "unknown.png")
+        return trash["image"]
 
     @staticmethod
     def get_points(trash_id):
@@ -43,10 +39,8 @@ class TrashInfo:
         :param trash_id: The id of the trash item.
         :return: Points of the trash item or 0 if not found.
         """
-        for trash in TrashInfo.TRASH_TYPES:
-            if trash["id"] == trash_id:
-                return trash["points"]
-        return 0
+        trash = catalogue.get(trash_id)
+        return trash["points"] if trash else 0
 
     def collect_trash(self, trash_info):
         """
@@ -57,7 +51,7 @@ class TrashInfo:
         trash_id = trash_info["id"]
         if trash_id not in self.collected_trash:
             self.collected_trash[trash_id] = trash_info
-            print(f"Collected trash with {trash_info['points']} points.")
+            print(f"Collected {trash_info['name'] or 'trash'} with {trash_info['points']} points.")
         else:
             print(f"Trash with id {trash_id} has already been collected.")
 
@@ -69,6 +63,141 @@ class TrashInfo:
         """
         return self.collected_trash
 
+class TrashImageCache:
+    THUMBNAIL_SIZE = (113, 150)  # DataBook grid
+    DETAIL_SIZE = (360, 450)  # info box
+    HEADER = struct.Struct("<qII")  # source mtime in ns, width, height
+
+    def __init__(self, cache_dir=None, max_details=4):
+        """
+        Initialize the cache of pre-scaled trash images.
+
+        Only the thumbnails of one DataBook page are kept. Detail images are
+        made when first shown and only the max_details most recently shown
+        stay in memory, so the cost does not grow with the catalogue.
+
+        :param cache_dir: Optional folder for scaled copies on disk, so later
+                          launches skip decoding and scaling the PNG files.
+        :param max_details: How many detail images are kept.
+        """
+        self.cache_dir = cache_dir
+        self.max_details = max_details
+        self.scaled = {}  # trash id -> thumbnail made by the fill thread, not converted yet
+        self.thumbnails = {}  # trash id -> thumbnail of the current page, in the display format
+        self.details = OrderedDict()  # trash id -> detail image, least recently shown first
+        self.loader = None
+
+    def _disk_path(self, image_path, size):
+        name = os.path.splitext(os.path.basename(image_path))[0]
+        return os.path.join(self.cache_dir, f"{name}_{size[0]}x{size[1]}.rgba")
+
+    def _load_scaled(self, image_path, size):
+        """
+        Scale an image, reading and writing the on-disk copy when a cache folder is set.
+        A copy made from an older version of the source file is ignored and rewritten.
+        """
+        if not self.cache_dir:
+            return pygame.transform.scale(pygame.image.load(image_path), size)
+
+        mtime = os.stat(image_path).st_mtime_ns
+        disk_path = self._disk_path(image_path, size)
+        try:
+            with open(disk_path, 'rb') as f:
+                cached_mtime, width, height = self.HEADER.unpack(f.read(self.HEADER.size))
+                if cached_mtime == mtime and (width, height) == tuple(size):
+                    return pygame.image.frombytes(f.read(), (width, height), "RGBA")
+        except (OSError, struct.error, ValueError):
+            pass  # missing or broken, make it again
+
+        surface = pygame.transform.scale(pygame.image.load(image_path), size)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(disk_path, 'wb') as f:
+                f.write(self.HEADER.pack(mtime, size[0], size[1]))
+                f.write(pygame.image.tobytes(surface, "RGBA"))
+        except OSError:
+            pass  # the disk cache is only an optimisation
+        return surface
+
+    def _make(self, trash_id, size):
+        """Scale the image of a trash type, from the asset pack when it has it (safe to call from the fill thread)."""
+        image_path = TrashInfo.get_image(trash_id)
+        if assets.pack:
+            image = assets.pack.image(image_path, size)  # on top of the mapped file, no pixels of its own
+            if image is not None:
+                return image
+        return self._load_scaled(image_path, size)
+
+    @staticmethod
+    def _ready(image):
+        """Convert an image to the display format unless it already is (pack images usually are)."""
+        display = pygame.display.get_surface()
+        if display is None or (image.get_flags() & pygame.SRCALPHA and
+                               image.get_masks()[:3] == display.get_masks()[:3]):
+            return image
+        return image.convert_alpha()
+
+    def fill(self, trash_ids, background=False):
+        """
+        Prepare the thumbnails of some trash types, usually one DataBook page,
+        and forget the thumbnails of all other types.
+
+        :param trash_ids: Ids of the trash types.
+        :param background: Do the work on a background thread and return at once.
+        """
+        trash_ids = list(trash_ids)
+        if self.loader is not None:
+            self.loader.join()  # the previous page, so the two never write at the same time
+        keep = set(trash_ids)
+        self.thumbnails = {trash_id: image for trash_id, image in self.thumbnails.items() if trash_id in keep}
+        self.scaled = {trash_id: image for trash_id, image in self.scaled.items() if trash_id in keep}
+
+        def fill_all():
+            for trash_id in trash_ids:
+                if trash_id not in self.scaled and trash_id not in self.thumbnails:
+                    self.scaled[trash_id] = self._make(trash_id, self.THUMBNAIL_SIZE)
+
+        if background:
+            self.loader = threading.Thread(target=fill_all, name="trash-images", daemon=True)
+            self.loader.start()
+        else:
+            self.loader = None
+            fill_all()
+
+    def thumbnail(self, trash_id):
+        """
+        Get the DataBook thumbnail of a trash type.
+
+        :return: A shared pygame Surface, do not draw onto it.
+        """
+        image = self.thumbnails.get(trash_id)
+        if image is None:
+            if self.loader is not None and trash_id not in self.scaled:
+                self.loader.join()  # the background fill will have it soon
+            image = self.scaled.pop(trash_id, None)
+            if image is None:
+                image = self._make(trash_id, self.THUMBNAIL_SIZE)
+            image = self.thumbnails[trash_id] = self._ready(image)
+        return image
+
+    def detail(self, trash_id):
+        """
+        Get the info box image of a trash type, made on first use and kept in a small LRU.
+
+        :return: A shared pygame Surface, do not draw onto it.
+        """
+        image = self.details.get(trash_id)
+        if image is None:
+            image = self.details[trash_id] = self._ready(self._make(trash_id, self.DETAIL_SIZE))
+            while len(self.details) > self.max_details:
+                self.details.popitem(last=False)
+        else:
+            self.details.move_to_end(trash_id)
+        return image
+
+
+trash_images = TrashImageCache()
+
 def display_trash_info(screen, x, y, trash_id):
     """
     Display the image of the trash on the screen at position (x, y) and the instruction text.
@@ -78,54 +207,71 @@ def display_trash_info(screen, x, y, trash_id):
     :param y: The y-coordinate of the box.
     :param trash_id: The ID of the trash to get the image.
     """
-    # Get the image path from TrashInfo
-    image_path = TrashInfo.get_image(trash_id)
-    image = pygame.image.load(image_path)
-    image = pygame.transform.scale(image, (360, 450))
+    # Get the pre-scaled image of this trash
+    image = trash_images.detail(trash_id)
 
     # Draw the image on the screen
     screen.blit(image, (x, y))
 
     # Draw the instruction text
-    font_path = pygame.font.match_font('Tahoma')  # Use Tahoma font for Vietnamese support
-    font = pygame.font.Font(font_path, 36)
-    text = font.render("Press space to continue", True, (255, 255, 255))
+    font = get_font('Tahoma', 36)  # Use Tahoma font for Vietnamese support
+    text = render_text("Press space to continue", font, (255, 255, 255))
     text_rect = text.get_rect(center=(x + 180, y + 480))
     screen.blit(text, text_rect)
 
 class DataBook:
+    # Thumbnails per page, the number keys 1 to 9 and 0 pick one of them
+    COLUMNS = 5
+    ROWS = 2
+    PAGE_SIZE = COLUMNS * ROWS
+
     def __init__(self):
-        self.collected_trash = {i: False for i in range(1, 11)}
+        self.collected_trash = {trash["id"]: False for trash in catalogue}
         self.displaying_trash_id = None  # ID of the trash being displayed
+        self.page = 0
+
+    def page_count(self):
+        return (len(catalogue) + self.PAGE_SIZE - 1) // self.PAGE_SIZE
+
+    def page_types(self):
+        """Return the trash types shown on the current page."""
+        first = self.page * self.PAGE_SIZE
+        return catalogue.types[first:first + self.PAGE_SIZE]
+
+    def prepare_page(self, background=True):
+        """Scale the thumbnails of the current page, and only those, before they are drawn."""
+        trash_images.fill([trash["id"] for trash in self.page_types()], background)
 
     def collect_trash(self, trash_id):
         self.collected_trash[trash_id] = True
 
     def draw(self, screen):
         screen.fill((255, 255, 255))  # Clear the screen with white background
-        font = pygame.font.Font(pygame.font.match_font('Tahoma'), 14)
-        text = font.render("Press space to exit", True, (0, 0, 0))
+        font = get_font('Tahoma', 14)
+        text = render_text("Press space to exit", font, (0, 0, 0))
         screen.blit(text, (screen.get_width() // 2 - text.get_width() // 2, 10))
 
-        for i, trash in enumerate(TrashInfo.TRASH_TYPES):
-            x = 50 + (i % 5) * 150
-            y = 100 + (i // 5) * 250  # Increase spacing vertically
+        for i, trash in enumerate(self.page_types()):
+            x = 50 + (i % self.COLUMNS) * 150
+            y = 100 + (i // self.COLUMNS) * 250  # Increase spacing vertically
             if self.collected_trash[trash["id"]]:
-                image = pygame.image.load(trash["image"])
-                image = pygame.transform.scale(image, (113, 150))
+                image = trash_images.thumbnail(trash["id"])
                 screen.blit(image, (x, y))
             else:
                 pygame.draw.rect(screen, (200, 200, 200), (x, y, 100, 100))
-                text = font.render("not collected", True, (0, 0, 0))
+                text = render_text("not collected", font, (0, 0, 0))
                 screen.blit(text, (x + 5, y + 45))
 
-            # numbering the trash items
-            number_text = font.render(str(i + 1), True, (0, 0, 0))
+            # numbering the trash items with the key that shows them
+            number_text = render_text(str((i + 1) % 10), font, (0, 0, 0))
             screen.blit(number_text, (x + 45, y + 160))
 
         # description instruction
-        instruction_font = pygame.font.Font(pygame.font.match_font('Tahoma'), 18)
-        instruction_text = instruction_font.render("Press number keys for details, space to exit", True, (255, 0, 0))
+        instruction_font = get_font('Tahoma', 18)
+        instruction = "Press number keys for details, space to exit"
+        if self.page_count() > 1:
+            instruction = f"Page {self.page + 1}/{self.page_count()}, arrow keys to turn. " + instruction
+        instruction_text = render_text(instruction, instruction_font, (255, 0, 0))
         screen.blit(instruction_text, (screen.get_width() // 2 - instruction_text.get_width() // 2, screen.get_height() - 30))
 
         # Display trash image if any
@@ -134,13 +280,19 @@ class DataBook:
 
     def handle_key_event(self, event):
         """
-        Handle key press events to display detailed trash images.
+        Handle key press events to display detailed trash images and turn pages.
         """
         if event.type == pygame.KEYDOWN:
-            if pygame.K_1 <= event.key <= pygame.K_0 + 10:
-                trash_id = event.key - pygame.K_0
-                if self.collected_trash.get(trash_id):
-                    self.displaying_trash_id = trash_id
+            if pygame.K_0 <= event.key <= pygame.K_9:
+                slot = (event.key - pygame.K_1) % 10  # 1 is the first thumbnail, 0 the tenth
+                page = self.page_types()
+                if slot < len(page) and self.collected_trash.get(page[slot]["id"]):
+                    self.displaying_trash_id = page[slot]["id"]
+            elif event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                step = 1 if event.key == pygame.K_RIGHT else -1
+                self.page = (self.page + step) % self.page_count()
+                self.displaying_trash_id = None
+                self.prepare_page()
             elif event.key == pygame.K_SPACE:
                 if self.displaying_trash_id:
                     self.displaying_trash_id = None
@@ -148,20 +300,22 @@ class DataBook:
                     return True
         return False
 
-    def back_button_clicked(self):
+    def back_button_clicked(self, frame):
         """
         Check if the user clicked the space key to exit.
+
+        :param frame: The InputFrame of this frame.
         """
-        for event in pygame.event.get():
+        exit_book = False
+        for event in frame.events:
             if self.handle_key_event(event):
-                return True
-        return False
+                exit_book = True
+        return exit_book
 
-def hide_trash_info():
+def hide_trash_info(frame):
     """
     Hide the box when the user presses the space key.
+
+    :param frame: The InputFrame of this frame.
     """
-    for event in pygame.event.get():
-        if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
-            return True
-    return False
+    return frame.key_pressed(pygame.K_SPACE)
@@ -1,5 +1,4 @@
 import pygame
-import time
 
 class Tyme:
     def __init__(self, duration_minutes):
@@ -10,7 +9,6 @@ class Tyme:
         """
         self.total_time = duration_minutes * 60  # Convert minutes to seconds
         self.remaining_time = self.total_time
-        self.start_time = time.time()
         self.bar_width = 630  # Slightly smaller for margins
         self.bar_height = 25  # Slightly taller
         self.margin = 19  # Margin from screen edges
@@ -21,27 +19,26 @@ class Tyme:
         Reset the timer to its full duration.
         """
         self.remaining_time = self.total_time
-        self.start_time = time.time()
         self.paused = False
 
-    def update(self, screen, display_info):
+    def tick(self, seconds, display_info=False):
         """
-        Update the timer and draw the time bar on the screen.
+        Advance the timer by simulation time instead of reading the wall clock.
 
-        :param screen: The pygame display surface.
-        :param display_info: Boolean indicating if the trash info display is active.
+        :param seconds: Length of one simulation step.
+        :param display_info: Boolean indicating if the trash info display is active, the timer stops while it is.
         """
-        if display_info:
-            self.paused = True
-        else:
-            if self.paused:
-                self.start_time = time.time() - (self.total_time - self.remaining_time)
-                self.paused = False
+        self.paused = display_info
+        if not display_info:
+            self.remaining_time = max(0, self.remaining_time - seconds)
 
-            # Calculate remaining time
-            elapsed_time = time.time() - self.start_time
-            self.remaining_time = max(0, self.total_time - elapsed_time)
+    def draw(self, screen):
+        """
+        Draw the time bar on the screen.
 
+        :param screen: The pygame display surface.
+        :return: The area of the screen covered by the time bar.
+        """
         # Calculate the current width of the time bar
         current_width = int((self.remaining_time / self.total_time) * self.bar_width)
 
@@ -64,9 +61,9 @@ class Tyme:
                          current_width, self.bar_height))
         
         # Draw border
-        pygame.draw.rect(screen, (0, 0, 0),
-                        (self.margin + 120, self.margin,
-                         self.bar_width, self.bar_height), 2)
+        return pygame.draw.rect(screen, (0, 0, 0),
+                                (self.margin + 120, self.margin,
+                                 self.bar_width, self.bar_height), 2)
 
     def time_up(self):
         """
@@ -0,0 +1,121 @@
+import queue
+import threading
+import time
+import cv2
+import pygame
+
+
+class VideoPlayer:
+    def __init__(self, video_path, size, buffer_frames=8):
+        """
+        Initialize a video player that decodes ahead on a background thread.
+
+        :param video_path: Path to the video file.
+        :param size: Tuple (width, height) the video is scaled to on screen.
+        :param buffer_frames: How many decoded frames may wait in the queue.
+        """
+        self.video_path = video_path
+        self.size = size
+        self.frames = queue.Queue(maxsize=buffer_frames)
+        self.stop_event = threading.Event()
+        self.fps = 30.0
+        self.shown = 0
+        self.dropped = 0
+        self.late = 0
+
+    def _decode(self, cap):
+        """Read frames into the queue until the file ends or playback is stopped."""
+        index = 0
+        try:
+            while not self.stop_event.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                while not self.stop_event.is_set():
+                    try:
+                        self.frames.put((index, frame), timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                index += 1
+        finally:
+            cap.release()
+            # Tell the player there is nothing more, even if the queue is full
+            while True:
+                try:
+                    self.frames.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    if self.stop_event.is_set():
+                        break
+
+    def play(self, screen):
+        """
+        Play the video, keeping to the file's frame rate.
+
+        Frames that are already more than one frame late are dropped instead
+        of being shown, so a slow decoder or blit never slows the video down.
+
+        :param screen: The pygame display surface.
+        :return: False if the window was closed during playback, True otherwise.
+        """
+        cap = cv2.VideoCapture(self.video_path)
+        if not cap.isOpened():
+            cap.release()
+            return True
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        if fps and fps > 0:
+            self.fps = fps
+        frame_time = 1.0 / self.fps
+
+        decoder = threading.Thread(target=self._decode, args=(cap,), name="video-decode", daemon=True)
+        decoder.start()
+
+        scaled = None  # destination Surface, created once and reused for every frame
+        start = None
+        running = True
+        while running:
+            item = self.frames.get()
+            if item is None:
+                break
+            index, frame = item
+            if start is None:
+                start = time.perf_counter()
+
+            due = start + index * frame_time
+            now = time.perf_counter()
+            if now > due + frame_time:
+                self.dropped += 1
+            else:
+                if now < due:
+                    time.sleep(due - now)
+                elif now - due > 0.002:
+                    self.late += 1
+
+                # Wrap the BGR array directly, rows are already in screen order so no rotate/flip
+                height, width = frame.shape[:2]
+                surface = pygame.image.frombuffer(frame, (width, height), "BGR")
+                if scaled is None:
+                    scaled = pygame.Surface(self.size, 0, surface)
+                pygame.transform.scale(surface, self.size, scaled)
+                screen.blit(scaled, (0, 0))
+                pygame.display.update()
+                self.shown += 1
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+
+        self.stop_event.set()
+        decoder.join()
+        print(f"Video {self.video_path}: {self.shown} shown, {self.dropped} dropped, "
+              f"{self.late} late at {self.fps:.1f} fps")
+        return running
+
+    def stats(self):
+        """
+        Return playback counters.
+
+        :return: Dictionary with shown, dropped and late frame counts.
+        """
+        return {"shown": self.shown, "dropped": self.dropped, "late": self.late}
@@ -0,0 +1,71 @@
+class TimingWheel:
+    def __init__(self, tick_ms=100, slots=128, start=0):
+        """
+        Initialize a hashed timing wheel of deadlines.
+
+        Every item goes into the slot of the tick its deadline falls in.
+        Advancing the clock only visits the slots of the ticks that passed, so
+        finding what expired costs about as much as what expired, not as much
+        as everything that is waiting. A deadline more than one turn of the
+        wheel away stays in its slot until the turn it belongs to.
+
+        :param tick_ms: Milliseconds covered by one slot.
+        :param slots: Number of slots, slots * tick_ms should be longer than the usual delay.
+        :param start: Clock value in milliseconds the wheel starts at.
+        """
+        self.tick_ms = tick_ms
+        self.slots = [{} for _ in range(slots)]  # item -> deadline, in scheduling order
+        self.slot_of = {}  # item -> slot index, so cancel does not search
+        self.tick = start // tick_ms  # first tick not fully handled yet
+
+    def schedule(self, item, deadline):
+        """
+        Add an item, or move it if it is already in the wheel.
+
+        :param item: Any hashable object.
+        :param deadline: Clock value in milliseconds when it expires.
+        """
+        self.cancel(item)
+        slot = max(deadline // self.tick_ms, self.tick) % len(self.slots)
+        self.slots[slot][item] = deadline
+        self.slot_of[item] = slot
+
+    def cancel(self, item):
+        """Remove an item before it expires. Does nothing if it is not in the wheel."""
+        slot = self.slot_of.pop(item, None)
+        if slot is not None:
+            del self.slots[slot][item]
+
+    def advance(self, now):
+        """
+        Move the clock forward and take out every item whose deadline has passed.
+
+        :param now: Current clock value in milliseconds.
+        :return: List of expired items, earliest slot first.
+        """
+        expired = []
+        now_tick = now // self.tick_ms
+        # A jump of more than one turn only has to look at every slot once
+        for tick in range(self.tick, min(now_tick, self.tick + len(self.slots) - 1) + 1):
+            slot = self.slots[tick % len(self.slots)]
+            if not slot:
+                continue
+            due = [item for item, deadline in slot.items() if deadline <= now]
+            for item in due:
+                del slot[item]
+                del self.slot_of[item]
+            expired.extend(due)
+        # The current tick is looked at again next time, its later deadlines are still waiting
+        self.tick = max(self.tick, now_tick)
+        return expired
+
+    def clear(self):
+        for slot in self.slots:
+            slot.clear()
+        self.slot_of.clear()
+
+    def __len__(self):
+        return len(self.slot_of)
+
+    def __contains__(self, item):
+        return item in self.slot_of